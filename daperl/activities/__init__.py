@@ -7,6 +7,13 @@ from daperl.activities.agent_activities import (
     run_execution_agent,
     run_reporting_agent,
     run_learning_agent,
+    run_agents_parallel,
+    run_dap_combined,
+)
+from daperl.activities.snapshot_activities import (
+    persist_phase_snapshot,
+    load_phase_snapshots,
+    clear_phase_snapshots,
 )
 
 __all__ = [
@@ -16,4 +23,9 @@ __all__ = [
     "run_execution_agent",
     "run_reporting_agent",
     "run_learning_agent",
+    "run_agents_parallel",
+    "run_dap_combined",
+    "persist_phase_snapshot",
+    "load_phase_snapshots",
+    "clear_phase_snapshots",
 ]
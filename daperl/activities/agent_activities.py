@@ -1,9 +1,19 @@
 """Activity wrappers for DAPERL agents."""
 
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import ValidationError
 from temporalio import activity
 
+from daperl.core.agents import BaseAgent
 from daperl.core.models import (
     AgentContext,
+    AgentResult,
+    AnyPhaseResult,
+    CombinedDAPResult,
     DetectionResult,
     AnalysisResult,
     PlanningResult,
@@ -19,8 +29,147 @@ from daperl.agents import (
     ReportingAgent,
     LearningAgent,
 )
-from daperl.config.settings import settings
+from daperl.activities.snapshot_activities import _snapshot_store
+from daperl.config.settings import (
+    DAPERLConfig,
+    LLMConfig,
+    _dotenv_snapshot,
+    get_settings,
+)
+from daperl.core.types import AgentPhase
+from daperl.llm.cache import SemanticCache
+from daperl.llm.factory import LLMFactory
+from daperl.storage.base import BaseLearningStorage
 from daperl.storage.json_storage import JSONLearningStorage
+from daperl.storage.phase_cache import PhaseResultCache
+
+ResultT = TypeVar("ResultT", bound=AgentResult)
+
+
+@lru_cache(maxsize=4)
+def _learning_storage(storage_type: str, storage_path: str) -> Optional[BaseLearningStorage]:
+    """
+    Learning storage backend, shared per worker process.
+    
+    A single instance per path keeps its lock effective across concurrent
+    activities and avoids re-checking the storage files on every call.
+    """
+    if storage_type == "json":
+        return JSONLearningStorage(storage_path)
+    return None
+
+
+@lru_cache(maxsize=1)
+def _semantic_cache() -> Optional[SemanticCache]:
+    """Detection semantic cache, shared per worker process when enabled."""
+    settings = get_settings()
+    if not settings.semantic_cache_enabled:
+        return None
+    return SemanticCache(
+        embedding_model=settings.semantic_cache_embedding_model,
+        threshold=settings.semantic_cache_threshold,
+        max_entries=settings.semantic_cache_max_entries,
+        api_key=settings.openai_api_key
+    )
+
+
+@lru_cache(maxsize=1)
+def _phase_cache() -> PhaseResultCache:
+    """Phase result cache, shared per worker process."""
+    settings = get_settings()
+    return PhaseResultCache(settings.phase_cache_path, settings.phase_cache_ttl_seconds)
+
+
+async def _run_memoized(
+    agent: BaseAgent,
+    context: AgentContext,
+    result_type: Type[ResultT]
+) -> ResultT:
+    """
+    Run an agent, reusing the result of an earlier run with the same inputs.
+    
+    Only for agents without side effects. Off unless the run's config has
+    ``{"memoize": true}`` or PHASE_CACHE_ENABLED is set, since the agents
+    sample their output and a hit replays an earlier answer instead of
+    asking again. Failed results are not cached.
+    
+    Args:
+        agent: The agent to run
+        context: Agent context
+        result_type: Result class of the agent's phase
+        
+    Returns:
+        The cached or freshly computed result
+    """
+    if not context.config.get("memoize", get_settings().phase_cache_enabled):
+        return await agent.run(context)
+    
+    cache = _phase_cache()
+    key = cache.make_key(result_type.__name__, context, agent.llm_config.model_dump_json())
+    cached = await cache.get(key)
+    if cached is not None:
+        try:
+            result = result_type.model_validate_json(cached)
+        except ValidationError:
+            # Written by an older version of the model; recompute it
+            pass
+        else:
+            if activity.logger.isEnabledFor(logging.INFO):
+                activity.logger.info(
+                    "Reusing cached phase result",
+                    extra={"phase": result.phase.value}
+                )
+            return result
+    
+    result = await agent.run(context)
+    if result.success:
+        await cache.set(key, result.model_dump_json())
+    return result
+
+
+# Agents are stateless between executions, so one instance per agent class
+# and LLM config is shared by all activities on the worker. This keeps LLM
+# clients (and their connection pools) alive across invocations.
+_agent_pool: Dict[Tuple[Type[BaseAgent], str], BaseAgent] = {}
+
+
+def _pooled_agent(agent_cls: Type[BaseAgent], llm_config: LLMConfig, **kwargs) -> BaseAgent:
+    """
+    Get the worker's shared agent instance for a class and LLM config.
+    
+    Args:
+        agent_cls: Agent class to instantiate
+        llm_config: LLM configuration for the agent
+        **kwargs: Additional constructor arguments, used only on first creation
+        
+    Returns:
+        The pooled agent instance
+    """
+    key = (agent_cls, llm_config.model_dump_json())
+    agent = _agent_pool.get(key)
+    if agent is None:
+        # Construction is synchronous, so no other coroutine can interleave here
+        agent = agent_cls(llm_config=llm_config, **kwargs)
+        _agent_pool[key] = agent
+    return agent
+
+
+def reload_config() -> None:
+    """
+    Reload settings from the environment and .env file.
+    
+    Everything built from the old settings is dropped, so the next activity
+    rebuilds its agents, LLM clients, storage and caches from the new ones.
+    """
+    _dotenv_snapshot.cache_clear()
+    get_settings.cache_clear()
+    
+    _agent_pool.clear()
+    LLMFactory.clear_cache()
+    _learning_storage.cache_clear()
+    _semantic_cache.cache_clear()
+    _phase_cache.cache_clear()
+    _snapshot_store.cache_clear()
 
 
 @activity.defn
@@ -34,23 +183,34 @@ async def run_detection_agent(context: AgentContext) -> DetectionResult:
     Returns:
         Detection result
     """
-    activity.logger.info("Starting detection agent", extra={"domain": context.domain})
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info("Starting detection agent", extra={"domain": context.domain})
     
     # Get configuration
-    daperl_config = settings.get_daperl_config()
+    daperl_config = get_settings().get_daperl_config()
     
     # Create and run agent
-    agent = DetectionAgent(llm_config=daperl_config.detection_llm)
-    result = await agent.execute(context)
-    
-    activity.logger.info(
-        "Detection complete",
-        extra={
-            "problems_found": len(result.problems),
-            "confidence": result.confidence
-        }
+    agent = _pooled_agent(
+        DetectionAgent,
+        daperl_config.detection_llm,
+        semantic_cache=_semantic_cache()
     )
     
+    # Analysis always follows detection; set up its agent and LLM client now
+    # so that work is already done if analysis lands on this worker
+    _pooled_agent(AnalysisAgent, daperl_config.analysis_llm)
+    
+    result = await _run_memoized(agent, context, DetectionResult)
+    
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Detection complete",
+            extra={
+                "problems_found": len(result.problems),
+                "confidence": result.confidence
+            }
+        )
+    
     return result
 
 
@@ -65,22 +225,24 @@ async def run_analysis_agent(context: AgentContext) -> AnalysisResult:
     Returns:
         Analysis result
     """
-    activity.logger.info("Starting analysis agent", extra={"domain": context.domain})
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info("Starting analysis agent", extra={"domain": context.domain})
     
     # Get configuration
-    daperl_config = settings.get_daperl_config()
+    daperl_config = get_settings().get_daperl_config()
     
     # Create and run agent
-    agent = AnalysisAgent(llm_config=daperl_config.analysis_llm)
-    result = await agent.execute(context)
-    
-    activity.logger.info(
-        "Analysis complete",
-        extra={
-            "root_causes": len(result.root_causes),
-            "confidence": result.confidence
-        }
-    )
+    agent = _pooled_agent(AnalysisAgent, daperl_config.analysis_llm)
+    result = await _run_memoized(agent, context, AnalysisResult)
+    
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Analysis complete",
+            extra={
+                "root_causes": len(result.root_causes),
+                "confidence": result.confidence
+            }
+        )
     
     return result
 
@@ -96,22 +258,24 @@ async def run_planning_agent(context: AgentContext) -> PlanningResult:
     Returns:
         Planning result
     """
-    activity.logger.info("Starting planning agent", extra={"domain": context.domain})
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info("Starting planning agent", extra={"domain": context.domain})
     
     # Get configuration
-    daperl_config = settings.get_daperl_config()
+    daperl_config = get_settings().get_daperl_config()
     
     # Create and run agent
-    agent = PlanningAgent(llm_config=daperl_config.planning_llm)
-    result = await agent.execute(context)
-    
-    activity.logger.info(
-        "Planning complete",
-        extra={
-            "actions_planned": len(result.plan.actions) if result.plan else 0,
-            "confidence": result.confidence
-        }
-    )
+    agent = _pooled_agent(PlanningAgent, daperl_config.planning_llm)
+    result = await _run_memoized(agent, context, PlanningResult)
+    
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Planning complete",
+            extra={
+                "actions_planned": len(result.plan.actions) if result.plan else 0,
+                "confidence": result.confidence
+            }
+        )
     
     return result
 
@@ -127,24 +291,31 @@ async def run_execution_agent(context: AgentContext) -> ExecutionResult:
     Returns:
         Execution result
     """
-    activity.logger.info("Starting execution agent", extra={"domain": context.domain})
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info("Starting execution agent", extra={"domain": context.domain})
     
     # Get configuration
+    settings = get_settings()
     daperl_config = settings.get_daperl_config()
     
     # Create and run agent
     # Note: Action registry should be provided via context.config if needed
-    agent = ExecutionAgent(llm_config=daperl_config.execution_llm)
-    result = await agent.execute(context)
-    
-    activity.logger.info(
-        "Execution complete",
-        extra={
-            "success_count": result.success_count,
-            "failure_count": result.failure_count,
-            "confidence": result.confidence
-        }
+    agent = _pooled_agent(
+        ExecutionAgent,
+        daperl_config.execution_llm,
+        max_parallel_actions=settings.max_parallel_actions
     )
+    result = await agent.run(context)
+    
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Execution complete",
+            extra={
+                "success_count": result.success_count,
+                "failure_count": result.failure_count,
+                "confidence": result.confidence
+            }
+        )
     
     return result
 
@@ -160,19 +331,21 @@ async def run_reporting_agent(context: AgentContext) -> ReportingResult:
     Returns:
         Reporting result
     """
-    activity.logger.info("Starting reporting agent", extra={"domain": context.domain})
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info("Starting reporting agent", extra={"domain": context.domain})
     
     # Get configuration
-    daperl_config = settings.get_daperl_config()
+    daperl_config = get_settings().get_daperl_config()
     
     # Create and run agent
-    agent = ReportingAgent(llm_config=daperl_config.reporting_llm)
-    result = await agent.execute(context)
+    agent = _pooled_agent(ReportingAgent, daperl_config.reporting_llm)
+    result = await agent.run(context)
     
-    activity.logger.info(
-        "Reporting complete",
-        extra={"confidence": result.confidence}
-    )
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Reporting complete",
+            extra={"confidence": result.confidence}
+        )
     
     return result
 
@@ -188,31 +361,143 @@ async def run_learning_agent(context: AgentContext) -> LearningResult:
     Returns:
         Learning result
     """
-    activity.logger.info("Starting learning agent", extra={"domain": context.domain})
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info("Starting learning agent", extra={"domain": context.domain})
     
     # Get configuration
+    settings = get_settings()
     daperl_config = settings.get_daperl_config()
     learning_config = settings.get_learning_config()
     
-    # Create storage backend
-    storage = None
-    if learning_config.storage_type == "json":
-        storage = JSONLearningStorage(learning_config.storage_path)
-    
     # Create and run agent
-    agent = LearningAgent(
-        llm_config=daperl_config.learning_llm,
-        storage=storage
-    )
-    result = await agent.execute(context)
-    
-    activity.logger.info(
-        "Learning complete",
-        extra={
-            "insights_generated": len(result.insights),
-            "patterns_found": result.patterns_found,
-            "confidence": result.confidence
-        }
+    agent = _pooled_agent(
+        LearningAgent,
+        daperl_config.learning_llm,
+        storage=_learning_storage(learning_config.storage_type, learning_config.storage_path)
     )
+    result = await agent.run(context)
+    
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Learning complete",
+            extra={
+                "insights_generated": len(result.insights),
+                "patterns_found": result.patterns_found,
+                "confidence": result.confidence
+            }
+        )
     
     return result
+
+
+@activity.defn
+async def run_dap_combined(context: AgentContext) -> CombinedDAPResult:
+    """
+    Run detection, analysis and planning in one activity.
+    
+    For inputs where each phase is quick, this saves the task queue round
+    trips and history events of two activities. Analysis and planning are
+    skipped when detection finds no problems, as in the workflow.
+    
+    Args:
+        context: Agent context
+        
+    Returns:
+        The detection result, plus the analysis and planning results if
+        those phases ran
+    """
+    detection_result = await run_detection_agent(context)
+    if not detection_result.problems_detected:
+        return CombinedDAPResult(detection_result=detection_result)
+    context.add_result(detection_result)
+    
+    analysis_result = await run_analysis_agent(context)
+    context.add_result(analysis_result)
+    
+    planning_result = await run_planning_agent(context)
+    
+    return CombinedDAPResult(
+        detection_result=detection_result,
+        analysis_result=analysis_result,
+        planning_result=planning_result
+    )
+
+
+def _build_agent(agent_type: AgentPhase, daperl_config: DAPERLConfig) -> BaseAgent:
+    """Create the agent for a phase using its per-agent LLM configuration."""
+    if agent_type == AgentPhase.DETECTION:
+        return _pooled_agent(
+            DetectionAgent,
+            daperl_config.detection_llm,
+            semantic_cache=_semantic_cache()
+        )
+    elif agent_type == AgentPhase.ANALYSIS:
+        return _pooled_agent(AnalysisAgent, daperl_config.analysis_llm)
+    elif agent_type == AgentPhase.PLANNING:
+        return _pooled_agent(PlanningAgent, daperl_config.planning_llm)
+    elif agent_type == AgentPhase.EXECUTION:
+        return _pooled_agent(
+            ExecutionAgent,
+            daperl_config.execution_llm,
+            max_parallel_actions=get_settings().max_parallel_actions
+        )
+    elif agent_type == AgentPhase.REPORTING:
+        return _pooled_agent(ReportingAgent, daperl_config.reporting_llm)
+    elif agent_type == AgentPhase.LEARNING:
+        learning_config = get_settings().get_learning_config()
+        return _pooled_agent(
+            LearningAgent,
+            daperl_config.learning_llm,
+            storage=_learning_storage(learning_config.storage_type, learning_config.storage_path)
+        )
+    raise ValueError(f"Unknown agent type: {agent_type}")
+
+
+@activity.defn
+async def run_agents_parallel(
+    contexts: List[AgentContext],
+    agent_type: str
+) -> List[AnyPhaseResult]:
+    """
+    Run one agent type over several independent contexts concurrently.
+    
+    Use this to fan out independent work (e.g. detection over multiple domains)
+    in a single activity. At most ``settings.max_parallel_agents`` agents call
+    their LLM at the same time so provider rate limits are respected.
+    
+    Args:
+        contexts: Agent contexts, one per independent unit of work
+        agent_type: Agent phase name (e.g. "detection", "analysis")
+        
+    Returns:
+        Agent results, in the same order as ``contexts``
+    """
+    phase = AgentPhase(agent_type)
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Starting parallel agents",
+            extra={"agent_type": phase.value, "count": len(contexts)}
+        )
+    
+    # Get configuration
+    settings = get_settings()
+    daperl_config = settings.get_daperl_config()
+    semaphore = asyncio.Semaphore(settings.max_parallel_agents)
+    
+    async def run_one(context: AgentContext) -> AgentResult:
+        async with semaphore:
+            agent = _build_agent(phase, daperl_config)
+            return await agent.run(context)
+    
+    results = await asyncio.gather(*(run_one(context) for context in contexts))
+    
+    if activity.logger.isEnabledFor(logging.INFO):
+        activity.logger.info(
+            "Parallel agents complete",
+            extra={
+                "agent_type": phase.value,
+                "succeeded": sum(1 for result in results if result.success)
+            }
+        )
+    
+    return list(results)
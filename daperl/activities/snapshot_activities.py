@@ -0,0 +1,64 @@
+"""Activities that store and load phase results of workflow runs."""
+
+from functools import lru_cache
+from typing import Dict, Optional
+
+from temporalio import activity
+
+from daperl.config.settings import get_settings
+from daperl.storage.phase_cache import PhaseSnapshotStore
+
+
+@lru_cache(maxsize=1)
+def _snapshot_store() -> PhaseSnapshotStore:
+    """Phase snapshot store, shared per worker process."""
+    settings = get_settings()
+    return PhaseSnapshotStore(settings.phase_snapshot_path, settings.phase_snapshot_ttl_seconds)
+
+
+@activity.defn
+def persist_phase_snapshot(run_key: str, phase: str, result_json: str) -> None:
+    """
+    Store the result of a finished phase.
+    
+    A cheap file write meant to run as a local activity.
+    
+    Args:
+        run_key: Key of the workflow run
+        phase: Name of the phase
+        result_json: JSON of the phase result
+    """
+    _snapshot_store().save(run_key, phase, result_json)
+
+
+@activity.defn
+def load_phase_snapshots(run_key: str, ttl_seconds: Optional[float] = None) -> Dict[str, str]:
+    """
+    Load the stored phase results of a workflow run.
+    
+    A cheap file read meant to run as a local activity.
+    
+    Args:
+        run_key: Key of the workflow run
+        ttl_seconds: Ignore results older than this; defaults to the
+            configured phase snapshot TTL
+    
+    Returns:
+        Phase name -> result JSON, for every phase with a fresh snapshot
+    """
+    if ttl_seconds is None:
+        ttl_seconds = get_settings().phase_snapshot_ttl_seconds
+    return _snapshot_store().load(run_key, ttl_seconds)
+
+
+@activity.defn
+def clear_phase_snapshots(run_key: str) -> None:
+    """
+    Delete the stored phase results of a completed workflow run.
+    
+    A cheap file removal meant to run as a local activity.
+    
+    Args:
+        run_key: Key of the workflow run
+    """
+    _snapshot_store().clear(run_key)
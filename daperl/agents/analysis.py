@@ -1,13 +1,41 @@
 """Analysis agent implementation."""
 
-import json
-from typing import Any
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
 
 from daperl.core.agents import BaseAnalysisAgent
-from daperl.core.models import AgentContext, AnalysisResult, DetectionResult, Problem
+from daperl.core.models import AgentContext, AnalysisResult, DetectionResult
+from daperl.core.serialization import PROBLEM_LIST_ADAPTER, context_data_block
 from daperl.llm.base import LLMMessage
 
 
+class AnalysisLLMResponse(BaseModel):
+    """Expected shape of the analysis LLM response."""
+    
+    root_causes: List[str]
+    recommendations: List[str]
+    confidence: float = Field(ge=0.0, le=1.0)
+    summary: str = "Analysis complete"
+
+
+@lru_cache(maxsize=32)
+def _analysis_system_prompt(domain: str) -> str:
+    """Build the analysis system prompt, which only depends on the domain."""
+    return f"""You are an analysis agent for the {domain} domain.
+
+Your task is to analyze detected problems and identify root causes and provide recommendations.
+
+Respond with a JSON object in this format:
+{{
+    "root_causes": ["list of identified root causes"],
+    "recommendations": ["list of recommendations for addressing the issues"],
+    "confidence": 0.0-1.0,
+    "summary": "brief summary of the analysis"
+}}"""
+
+
 class AnalysisAgent(BaseAnalysisAgent):
     """
     Agent that analyzes detected problems to find root causes.
@@ -15,6 +43,8 @@ class AnalysisAgent(BaseAnalysisAgent):
     This is a generic implementation that can be extended for specific domains.
     """
     
+    __slots__ = ()
+    
     async def execute(self, context: AgentContext) -> AnalysisResult:
         """
         Analyze detected problems.
@@ -25,19 +55,15 @@ class AnalysisAgent(BaseAnalysisAgent):
         Returns:
             Analysis result with root causes and recommendations
         """
+        # Short-circuit when there is nothing to analyze
+        skipped = self.precheck(context)
+        if skipped is not None:
+            return skipped
+        
         if not self.llm_client:
             raise ValueError("LLM client not configured for AnalysisAgent")
         
-        # Get detection results from history
-        detection_result = self._get_detection_result(context)
-        if not detection_result or not detection_result.problems:
-            return AnalysisResult(
-                success=True,
-                message="No problems to analyze",
-                confidence=1.0,
-                confidence_level="very_high",
-                analysis_summary="No problems detected, no analysis needed"
-            )
+        detection_result = context.get_result(DetectionResult)
         
         # Build analysis prompt
         system_prompt = self._build_system_prompt(context)
@@ -45,29 +71,51 @@ class AnalysisAgent(BaseAnalysisAgent):
         
         messages = [LLMMessage(role="user", content=user_message)]
         
-        # Get analysis from LLM
-        response = await self.llm_client.complete_with_json(
-            messages=messages,
-            system_prompt=system_prompt
-        )
-        
-        # Validate and parse response
-        if not self.validate_output(response):
-            raise ValueError(f"Invalid analysis output: {response}")
+        # Get analysis from LLM, parsed and validated in one pass
+        try:
+            response = await self._complete_json(
+                messages,
+                system_prompt,
+                AnalysisLLMResponse,
+                cache_system_prompt=True
+            )
+        except ValidationError as e:
+            raise ValueError(f"Invalid analysis output: {e}") from e
         
-        confidence = response.get("confidence", 0.7)
+        confidence = response.confidence
         
         return AnalysisResult(
             success=True,
-            message=f"Analysis complete: {len(response.get('root_causes', []))} root causes identified",
+            message=f"Analysis complete: {len(response.root_causes)} root causes identified",
             confidence=confidence,
             confidence_level=self._get_confidence_level(confidence),
             analyzed_problems=detection_result.problems,
-            root_causes=response.get("root_causes", []),
-            recommendations=response.get("recommendations", []),
-            analysis_summary=response.get("summary", "Analysis complete")
+            root_causes=response.root_causes,
+            recommendations=response.recommendations,
+            analysis_summary=response.summary
         )
     
+    def precheck(self, context: AgentContext) -> Optional[AnalysisResult]:
+        """
+        Check whether analysis can be skipped without calling the LLM.
+        
+        Args:
+            context: The agent context with detection results
+            
+        Returns:
+            The short-circuit result if there are no problems, None otherwise
+        """
+        detection_result = context.get_result(DetectionResult)
+        if not detection_result or not detection_result.problems:
+            return AnalysisResult(
+                success=True,
+                message="No problems to analyze",
+                confidence=1.0,
+                confidence_level="very_high",
+                analysis_summary="No problems detected, no analysis needed"
+            )
+        return None
+    
     def validate_output(self, output: Any) -> bool:
         """
         Validate the analysis output.
@@ -78,46 +126,20 @@ class AnalysisAgent(BaseAnalysisAgent):
         Returns:
             True if valid, False otherwise
         """
-        if not isinstance(output, dict):
+        try:
+            AnalysisLLMResponse.model_validate(output)
+        except ValidationError:
             return False
-        
-        required_fields = ["root_causes", "recommendations", "confidence"]
-        for field in required_fields:
-            if field not in output:
-                return False
-        
-        if not isinstance(output["root_causes"], list):
-            return False
-        if not isinstance(output["recommendations"], list):
-            return False
-        
         return True
     
-    def _get_detection_result(self, context: AgentContext) -> DetectionResult:
-        """Extract detection result from context history."""
-        for result in context.history:
-            if isinstance(result, DetectionResult):
-                return result
-        return None
-    
     def _build_system_prompt(self, context: AgentContext) -> str:
         """Build the system prompt for analysis."""
-        return f"""You are an analysis agent for the {context.domain} domain.
-
-Your task is to analyze detected problems and identify root causes and provide recommendations.
-
-Respond with a JSON object in this format:
-{{
-    "root_causes": ["list of identified root causes"],
-    "recommendations": ["list of recommendations for addressing the issues"],
-    "confidence": 0.0-1.0,
-    "summary": "brief summary of the analysis"
-}}"""
+        return _analysis_system_prompt(context.domain)
     
     def _build_user_message(self, context: AgentContext, detection_result: DetectionResult) -> str:
         """Build the user message with detected problems."""
-        problems_str = json.dumps([p.model_dump() for p in detection_result.problems], indent=2)
-        data_str = json.dumps(context.data, indent=2)
+        problems_str = PROBLEM_LIST_ADAPTER.dump_json(detection_result.problems).decode()
+        data_str = context_data_block(context)
         
         message = f"""Domain: {context.domain}
 
@@ -1,12 +1,97 @@
 """Detection agent implementation."""
 
-import json
-import uuid
-from typing import Any
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
 
 from daperl.core.agents import BaseDetectionAgent
+from daperl.core.ids import new_ids
 from daperl.core.models import AgentContext, DetectionResult, Problem
+from daperl.core.serialization import context_data_block
 from daperl.llm.base import LLMMessage
+from daperl.llm.cache import SemanticCache
+
+
+class DetectedProblemSpec(BaseModel):
+    """A problem as reported by the detection LLM."""
+    
+    id: Optional[str] = None
+    type: str
+    description: str
+    severity: str = "medium"
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+
+class DetectionLLMResponse(BaseModel):
+    """Expected shape of the detection LLM response."""
+    
+    problems: List[DetectedProblemSpec]
+    confidence: float = Field(ge=0.0, le=1.0)
+    summary: Optional[str] = None
+    
+    def to_result(self, confidence_level: str) -> DetectionResult:
+        """
+        Convert the validated response into a detection result.
+        
+        Fields were already validated when the response was parsed, so the
+        problems are built without validating them a second time.
+        
+        Args:
+            confidence_level: Confidence level for the response confidence
+            
+        Returns:
+            The detection result
+        """
+        # Generate ids for any problems the LLM left out in one batch
+        generated_ids = iter(new_ids(sum(1 for p in self.problems if not p.id)))
+        problems = [
+            Problem.model_construct(
+                id=p.id or next(generated_ids),
+                type=p.type,
+                description=p.description,
+                severity=p.severity,
+                data=p.data
+            )
+            for p in self.problems
+        ]
+        
+        return DetectionResult(
+            success=True,
+            message=f"Detection complete: {len(problems)} problems found",
+            confidence=self.confidence,
+            confidence_level=confidence_level,
+            problems_detected=len(problems) > 0,
+            problems=problems,
+            summary=self.summary if self.summary is not None else f"Found {len(problems)} problems"
+        )
+
+
+@lru_cache(maxsize=32)
+def _detection_system_prompt(domain: str) -> str:
+    """Build the detection system prompt, which only depends on the domain."""
+    return f"""You are a detection agent for the {domain} domain.
+
+Your task is to analyze the provided data and detect any problems or issues that need attention.
+
+Respond with a JSON object in this format:
+{{
+    "problems": [
+        {{
+            "id": "unique-id",
+            "type": "problem_type",
+            "description": "description of the problem",
+            "severity": "info|low|medium|high|critical",
+            "data": {{}} // additional problem-specific data
+        }}
+    ],
+    "confidence": 0.0-1.0,
+    "summary": "brief summary of findings"
+}}
+
+Use "info" for findings worth reporting that need no remediation.
+If no problems are found, return an empty problems array with confidence and summary."""
 
 
 class DetectionAgent(BaseDetectionAgent):
@@ -16,6 +101,20 @@ class DetectionAgent(BaseDetectionAgent):
     This is a generic implementation that can be extended for specific domains.
     """
     
+    __slots__ = ("semantic_cache",)
+    
+    def __init__(self, semantic_cache: Optional[SemanticCache] = None, **kwargs):
+        """
+        Initialize the detection agent.
+        
+        Args:
+            semantic_cache: Optional cache that reuses responses for
+                near-duplicate input data
+            **kwargs: Additional arguments for base agent
+        """
+        super().__init__(**kwargs)
+        self.semantic_cache = semantic_cache
+    
     async def execute(self, context: AgentContext) -> DetectionResult:
         """
         Detect problems in the given context.
@@ -35,39 +134,31 @@ class DetectionAgent(BaseDetectionAgent):
         
         messages = [LLMMessage(role="user", content=user_message)]
         
-        # Get detection from LLM
-        response = await self.llm_client.complete_with_json(
-            messages=messages,
-            system_prompt=system_prompt
-        )
-        
-        # Validate and parse response
-        if not self.validate_output(response):
-            raise ValueError(f"Invalid detection output: {response}")
-        
-        # Extract problems
-        problems = []
-        for p in response.get("problems", []):
-            problem = Problem(
-                id=p.get("id", str(uuid.uuid4())),
-                type=p.get("type", "unknown"),
-                description=p.get("description", ""),
-                severity=p.get("severity", "medium"),
-                data=p.get("data", {})
-            )
-            problems.append(problem)
-        
-        confidence = response.get("confidence", 0.7)
-        
-        return DetectionResult(
-            success=True,
-            message=f"Detection complete: {len(problems)} problems found",
-            confidence=confidence,
-            confidence_level=self._get_confidence_level(confidence),
-            problems_detected=len(problems) > 0,
-            problems=problems,
-            summary=response.get("summary", f"Found {len(problems)} problems")
-        )
+        try:
+            # Reuse the response for semantically equivalent input if possible
+            response, key = None, None
+            if self.semantic_cache:
+                namespace = hashlib.sha256(
+                    f"{system_prompt}\0{self.llm_client.model}".encode()
+                ).hexdigest()
+                raw, key = await self.semantic_cache.lookup(namespace, user_message)
+                if raw is not None:
+                    response = DetectionLLMResponse.model_validate_json(raw)
+            
+            # Get detection from LLM, parsed and validated in one pass
+            if response is None:
+                response = await self._complete_json(
+                    messages,
+                    system_prompt,
+                    DetectionLLMResponse,
+                    cache_system_prompt=True
+                )
+                if key is not None:
+                    self.semantic_cache.add(key, response.model_dump_json())
+        except ValidationError as e:
+            raise ValueError(f"Invalid detection output: {e}") from e
+        
+        return response.to_result(self._get_confidence_level(response.confidence))
     
     def validate_output(self, output: Any) -> bool:
         """
@@ -79,51 +170,19 @@ class DetectionAgent(BaseDetectionAgent):
         Returns:
             True if valid, False otherwise
         """
-        if not isinstance(output, dict):
+        try:
+            DetectionLLMResponse.model_validate(output)
+        except ValidationError:
             return False
-        
-        # Must have problems list and confidence
-        if "problems" not in output or "confidence" not in output:
-            return False
-        
-        if not isinstance(output["problems"], list):
-            return False
-        
-        # Validate each problem has required fields
-        for problem in output["problems"]:
-            if not isinstance(problem, dict):
-                return False
-            if "type" not in problem or "description" not in problem:
-                return False
-        
         return True
     
     def _build_system_prompt(self, context: AgentContext) -> str:
         """Build the system prompt for detection."""
-        return f"""You are a detection agent for the {context.domain} domain.
-
-Your task is to analyze the provided data and detect any problems or issues that need attention.
-
-Respond with a JSON object in this format:
-{{
-    "problems": [
-        {{
-            "id": "unique-id",
-            "type": "problem_type",
-            "description": "description of the problem",
-            "severity": "low|medium|high|critical",
-            "data": {{}} // additional problem-specific data
-        }}
-    ],
-    "confidence": 0.0-1.0,
-    "summary": "brief summary of findings"
-}}
-
-If no problems are found, return an empty problems array with confidence and summary."""
+        return _detection_system_prompt(context.domain)
     
     def _build_user_message(self, context: AgentContext) -> str:
         """Build the user message with domain data."""
-        data_str = json.dumps(context.data, indent=2)
+        data_str = context_data_block(context)
         
         message = f"""Domain: {context.domain}
 
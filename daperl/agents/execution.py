@@ -1,18 +1,36 @@
 """Execution agent implementation."""
 
-import json
-from typing import Any, Dict, Callable
+import asyncio
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 
 from daperl.core.agents import BaseExecutionAgent
 from daperl.core.models import (
     AgentContext,
     ExecutionResult,
     PlanningResult,
+    Action,
     ActionResult,
 )
+from daperl.core.serialization import dumps_compact
 from daperl.llm.base import LLMMessage
 
 
+@lru_cache(maxsize=32)
+def _simulation_system_prompt(domain: str) -> str:
+    """Build the execution simulation system prompt, which only depends on the domain."""
+    return f"""You are an execution simulation agent for the {domain} domain.
+
+Describe what would happen if this action were executed. Provide a realistic outcome.
+
+Respond with JSON:
+{{
+    "success": true/false,
+    "message": "description of what happened",
+    "data": {{}} // any relevant data from the execution
+}}"""
+
+
 class ExecutionAgent(BaseExecutionAgent):
     """
     Agent that executes planned actions.
@@ -21,16 +39,25 @@ class ExecutionAgent(BaseExecutionAgent):
     The actual execution tools should be provided via context.config.
     """
     
-    def __init__(self, action_registry: Dict[str, Callable] = None, **kwargs):
+    __slots__ = ("action_registry", "max_parallel_actions")
+    
+    def __init__(
+        self,
+        action_registry: Dict[str, Callable] = None,
+        max_parallel_actions: int = 4,
+        **kwargs
+    ):
         """
         Initialize the execution agent.
         
         Args:
             action_registry: Dictionary mapping action types to callable functions
+            max_parallel_actions: Maximum number of independent actions run at once
             **kwargs: Additional arguments for base agent
         """
         super().__init__(**kwargs)
         self.action_registry = action_registry or {}
+        self.max_parallel_actions = max_parallel_actions
     
     async def execute(self, context: AgentContext) -> ExecutionResult:
         """
@@ -42,59 +69,26 @@ class ExecutionAgent(BaseExecutionAgent):
         Returns:
             Execution result with action outcomes
         """
-        # Get planning results from history
-        planning_result = self._get_planning_result(context)
-        if not planning_result or not planning_result.plan:
-            return ExecutionResult(
-                success=True,
-                message="No plan to execute",
-                confidence=1.0,
-                confidence_level="very_high",
-                plan_id="none",
-                execution_summary="No plan found, no execution needed"
-            )
+        # Short-circuit when there is nothing to execute
+        skipped = self.precheck(context)
+        if skipped is not None:
+            return skipped
         
-        plan = planning_result.plan
-        actions_executed = []
-        success_count = 0
-        failure_count = 0
-        
-        # Execute each action in the plan
-        for action in plan.actions:
-            try:
-                # Check if we have a handler for this action type
-                if action.action_type in self.action_registry:
-                    # Execute using registered handler
-                    handler = self.action_registry[action.action_type]
-                    result = await handler(action, context)
-                    
-                    action_result = ActionResult(
-                        action_id=action.id,
-                        success=result.get("success", True),
-                        message=result.get("message", f"Executed {action.action_type}"),
-                        data=result.get("data", {})
-                    )
-                else:
-                    # Use LLM to simulate/describe execution
-                    action_result = await self._simulate_execution(action, context)
-                
-                if action_result.success:
-                    success_count += 1
-                else:
-                    failure_count += 1
-                
-                actions_executed.append(action_result)
-                
-            except Exception as e:
-                failure_count += 1
-                actions_executed.append(
-                    ActionResult(
-                        action_id=action.id,
-                        success=False,
-                        message=f"Execution failed: {str(e)}",
-                        error=str(e)
-                    )
-                )
+        plan = context.get_result(PlanningResult).plan
+        semaphore = asyncio.Semaphore(self.max_parallel_actions)
+        results: List[Optional[ActionResult]] = [None] * len(plan.actions)
+        
+        async def run_bounded(index: int, action: Action) -> None:
+            async with semaphore:
+                results[index] = await self._run_action(action, context)
+        
+        # Run each dependency layer concurrently, one layer after another
+        for batch in self._dependency_batches(plan.actions):
+            await asyncio.gather(*(run_bounded(index, action) for index, action in batch))
+        
+        actions_executed = results
+        success_count = sum(1 for result in actions_executed if result.success)
+        failure_count = len(actions_executed) - success_count
         
         overall_success = failure_count == 0
         confidence = success_count / len(actions_executed) if actions_executed else 0.0
@@ -111,6 +105,103 @@ class ExecutionAgent(BaseExecutionAgent):
             execution_summary=f"Executed {len(actions_executed)} actions with {success_count} successes"
         )
     
+    async def _run_action(self, action: Action, context: AgentContext) -> ActionResult:
+        """
+        Execute a single action, capturing any failure in the result.
+        
+        Args:
+            action: The action to execute
+            context: The agent context
+            
+        Returns:
+            The outcome of the action
+        """
+        try:
+            # Check if we have a handler for this action type
+            if action.action_type in self.action_registry:
+                # Execute using registered handler
+                handler = self.action_registry[action.action_type]
+                result = await handler(action, context)
+                
+                return ActionResult(
+                    action_id=action.id,
+                    success=result.get("success", True),
+                    message=result.get("message", f"Executed {action.action_type}"),
+                    data=result.get("data", {})
+                )
+            
+            # Use LLM to simulate/describe execution
+            return await self._simulate_execution(action, context)
+            
+        except Exception as e:
+            return ActionResult(
+                action_id=action.id,
+                success=False,
+                message=f"Execution failed: {str(e)}",
+                error=str(e)
+            )
+    
+    def _dependency_batches(self, actions: List[Action]) -> List[List[tuple]]:
+        """
+        Group actions into layers whose dependencies are all in earlier layers.
+        
+        A plan in which no action declares dependencies runs in plan order,
+        one action at a time, since nothing says its actions are independent.
+        Otherwise dependencies on ids that are not part of the plan are
+        ignored. If a dependency cycle is found, the first remaining action is
+        run on its own to break it.
+        
+        Args:
+            actions: The planned actions, in plan order
+            
+        Returns:
+            Batches of (index, action) pairs, in plan order within each batch
+        """
+        if not any(action.depends_on for action in actions):
+            return [[(index, action)] for index, action in enumerate(actions)]
+        
+        plan_ids = {action.id for action in actions}
+        pending = list(enumerate(actions))
+        completed = set()
+        batches = []
+        
+        while pending:
+            ready = [
+                (index, action) for index, action in pending
+                if all(dep in completed or dep not in plan_ids for dep in action.depends_on)
+            ]
+            if not ready:
+                ready = pending[:1]
+            
+            batches.append(ready)
+            completed.update(action.id for _, action in ready)
+            ready_indexes = {index for index, _ in ready}
+            pending = [(index, action) for index, action in pending if index not in ready_indexes]
+        
+        return batches
+    
+    def precheck(self, context: AgentContext) -> Optional[ExecutionResult]:
+        """
+        Check whether execution can be skipped because there is no plan.
+        
+        Args:
+            context: The agent context with planning results
+            
+        Returns:
+            The short-circuit result if there is no plan, None otherwise
+        """
+        planning_result = context.get_result(PlanningResult)
+        if not planning_result or not planning_result.plan:
+            return ExecutionResult(
+                success=True,
+                message="No plan to execute",
+                confidence=1.0,
+                confidence_level="very_high",
+                plan_id="none",
+                execution_summary="No plan found, no execution needed"
+            )
+        return None
+    
     async def _simulate_execution(self, action, context: AgentContext) -> ActionResult:
         """
         Simulate action execution using LLM when no handler is registered.
@@ -125,22 +216,13 @@ class ExecutionAgent(BaseExecutionAgent):
                 data={"simulated": True}
             )
         
-        system_prompt = f"""You are an execution simulation agent for the {context.domain} domain.
-
-Describe what would happen if this action were executed. Provide a realistic outcome.
-
-Respond with JSON:
-{{
-    "success": true/false,
-    "message": "description of what happened",
-    "data": {{}} // any relevant data from the execution
-}}"""
+        system_prompt = _simulation_system_prompt(context.domain)
         
         user_message = f"""Action to execute:
 Type: {action.action_type}
 Description: {action.description}
 Target: {action.target}
-Parameters: {json.dumps(action.parameters, indent=2)}
+Parameters: {dumps_compact(action.parameters)}
 
 Simulate the execution and describe the outcome."""
         
@@ -172,10 +254,3 @@ Simulate the execution and describe the outcome."""
         if isinstance(output, ActionResult):
             return True
         return False
-    
-    def _get_planning_result(self, context: AgentContext) -> PlanningResult:
-        """Extract planning result from context history."""
-        for result in context.history:
-            if isinstance(result, PlanningResult):
-                return result
-        return None
@@ -1,11 +1,15 @@
 """Learning agent implementation."""
 
-import json
-import uuid
-from datetime import datetime
-from typing import Any, List
+import asyncio
+import contextlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
 
 from daperl.core.agents import BaseLearningAgent
+from daperl.core.ids import new_ids
 from daperl.core.models import (
     AgentContext,
     LearningResult,
@@ -14,12 +18,62 @@ from daperl.core.models import (
     AnalysisResult,
     PlanningResult,
     ExecutionResult,
-    ReportingResult,
     ExecutionMetric,
+    MetricSummary,
 )
 from daperl.llm.base import LLMMessage
 
 
+class InsightSpec(BaseModel):
+    """An insight as returned by the learning LLM."""
+    
+    id: Optional[str] = None
+    type: str = "general"
+    description: str = ""
+    confidence: float = Field(default=0.5, ge=0.0, le=1.0)
+
+
+class LearningLLMResponse(BaseModel):
+    """Expected shape of the learning LLM response."""
+    
+    insights: List[InsightSpec]
+    patterns_found: int = 0
+    recommendations: List[str]
+    confidence: float = Field(ge=0.0, le=1.0)
+    summary: str = "Learning analysis complete"
+
+
+@lru_cache(maxsize=32)
+def _learning_system_prompt(domain: str) -> str:
+    """Build the learning system prompt, which only depends on the domain."""
+    return f"""You are a learning agent for the {domain} domain.
+
+Your task is to analyze workflow executions and extract insights that can improve future performance.
+
+Consider:
+- What patterns emerge across executions?
+- Are detection thresholds appropriate?
+- Are certain problem types consistently resolved?
+- Are there recurring failures or issues?
+- What can be improved in future executions?
+
+Respond with a JSON object in this format:
+{{
+    "insights": [
+        {{
+            "id": "insight-id",
+            "type": "detection|analysis|planning|execution|general",
+            "description": "description of the insight",
+            "confidence": 0.0-1.0
+        }}
+    ],
+    "patterns_found": 0,
+    "recommendations": ["list of recommendations for improvement"],
+    "confidence": 0.0-1.0,
+    "summary": "brief summary of learning analysis"
+}}"""
+
+
 class LearningAgent(BaseLearningAgent):
     """
     Agent that learns from workflow executions to improve future performance.
@@ -33,6 +87,8 @@ class LearningAgent(BaseLearningAgent):
     This is a generic implementation that can be extended for specific domains.
     """
     
+    __slots__ = ("storage",)
+    
     def __init__(self, storage=None, **kwargs):
         """
         Initialize the learning agent.
@@ -57,62 +113,105 @@ class LearningAgent(BaseLearningAgent):
         if not self.llm_client:
             raise ValueError("LLM client not configured for LearningAgent")
         
+        # History does not depend on this execution, so start fetching it now
+        history_task = None
+        if self.storage:
+            history_task = asyncio.create_task(self.storage.get_recent_summaries(limit=10))
+        
         # Gather current execution metrics
         current_metrics = self._gather_execution_metrics(context)
         
-        # Store current execution
+        # Store current execution in the background while the LLM runs
+        store_task = None
         if self.storage:
-            await self.storage.store_metric(current_metrics)
+            store_task = asyncio.create_task(self.storage.store_metric(current_metrics))
         
-        # Retrieve historical executions for analysis
-        historical_metrics = []
-        if self.storage:
-            historical_metrics = await self.storage.get_recent_metrics(limit=10)
+        try:
+            historical_metrics = []
+            if history_task:
+                # Skip summaries from earlier attempts of this same run.
+                # Earlier runs that reused the workflow id still count.
+                historical_metrics = [
+                    summary for summary in await history_task
+                    if context.run_id is None or summary.run_id != context.run_id
+                ]
+            
+            result = await self._learn(context, current_metrics, historical_metrics)
+        except BaseException:
+            if history_task and not history_task.done():
+                history_task.cancel()
+            # Let the write finish, but keep the original error rather than
+            # replacing it with a storage failure
+            if store_task:
+                with contextlib.suppress(Exception):
+                    await store_task
+            raise
+        
+        # Surface storage failures rather than leaving the write unobserved
+        if store_task:
+            await store_task
+        return result
+    
+    async def _learn(
+        self,
+        context: AgentContext,
+        current_metrics: ExecutionMetric,
+        historical_metrics: List[MetricSummary]
+    ) -> LearningResult:
+        """
+        Ask the LLM for insights about this execution and store them.
         
+        Args:
+            context: The agent context with all phase results
+            current_metrics: Metrics gathered from the current execution
+            historical_metrics: Summaries of recent earlier executions
+            
+        Returns:
+            Learning result with insights and patterns
+        """
         # Build learning prompt
         system_prompt = self._build_system_prompt(context)
         user_message = self._build_user_message(context, current_metrics, historical_metrics)
         
         messages = [LLMMessage(role="user", content=user_message)]
         
-        # Get learning insights from LLM
-        response = await self.llm_client.complete_with_json(
-            messages=messages,
-            system_prompt=system_prompt
-        )
+        # Get learning insights from LLM, parsed and validated in one pass
+        try:
+            response = await self._complete_json(
+                messages,
+                system_prompt,
+                LearningLLMResponse
+            )
+        except ValidationError as e:
+            raise ValueError(f"Invalid learning output: {e}") from e
         
-        # Validate and parse response
-        if not self.validate_output(response):
-            raise ValueError(f"Invalid learning output: {response}")
-        
-        # Parse insights
-        insights = []
-        for insight_data in response.get("insights", []):
-            insight = LearningInsight(
-                id=insight_data.get("id", str(uuid.uuid4())),
-                insight_type=insight_data.get("type", "general"),
-                description=insight_data.get("description", ""),
-                confidence=insight_data.get("confidence", 0.5),
+        # Build insights from the validated specs, generating any missing ids
+        # in one batch
+        generated_ids = iter(new_ids(sum(1 for spec in response.insights if not spec.id)))
+        insights = [
+            LearningInsight.model_construct(
+                id=spec.id or next(generated_ids),
+                insight_type=spec.type,
+                description=spec.description,
+                confidence=spec.confidence,
                 supporting_executions=[context.workflow_id]
             )
-            insights.append(insight)
+            for spec in response.insights
+        ]
         
         # Store insights
         if self.storage:
-            for insight in insights:
-                await self.storage.store_insight(insight)
-        
-        confidence = response.get("confidence", 0.7)
+            await self.storage.store_insights(insights)
         
         return LearningResult(
             success=True,
             message=f"Learning complete: {len(insights)} insights generated",
-            confidence=confidence,
-            confidence_level=self._get_confidence_level(confidence),
+            confidence=response.confidence,
+            confidence_level=self._get_confidence_level(response.confidence),
             insights=insights,
-            patterns_found=response.get("patterns_found", 0),
-            recommendations=response.get("recommendations", []),
-            learning_summary=response.get("summary", "Learning analysis complete")
+            patterns_found=response.patterns_found,
+            recommendations=response.recommendations,
+            learning_summary=response.summary
         )
     
     def validate_output(self, output: Any) -> bool:
@@ -125,28 +224,18 @@ class LearningAgent(BaseLearningAgent):
         Returns:
             True if valid, False otherwise
         """
-        if not isinstance(output, dict):
-            return False
-        
-        required_fields = ["insights", "recommendations", "confidence"]
-        for field in required_fields:
-            if field not in output:
-                return False
-        
-        if not isinstance(output["insights"], list):
-            return False
-        if not isinstance(output["recommendations"], list):
+        try:
+            LearningLLMResponse.model_validate(output)
+        except ValidationError:
             return False
-        
         return True
     
     def _gather_execution_metrics(self, context: AgentContext) -> ExecutionMetric:
         """Gather metrics from the current execution."""
-        detection_result = self._get_result(context, DetectionResult)
-        analysis_result = self._get_result(context, AnalysisResult)
-        planning_result = self._get_result(context, PlanningResult)
-        execution_result = self._get_result(context, ExecutionResult)
-        reporting_result = self._get_result(context, ReportingResult)
+        detection_result = context.get_result(DetectionResult)
+        analysis_result = context.get_result(AnalysisResult)
+        planning_result = context.get_result(PlanningResult)
+        execution_result = context.get_result(ExecutionResult)
         
         # Determine overall success
         overall_success = True
@@ -155,95 +244,72 @@ class LearningAgent(BaseLearningAgent):
         
         return ExecutionMetric(
             workflow_id=context.workflow_id,
-            timestamp=datetime.utcnow(),
+            run_id=context.run_id,
+            timestamp=datetime.now(timezone.utc),
             domain=context.domain,
             detection_result=detection_result,
             analysis_result=analysis_result,
             planning_result=planning_result,
             execution_result=execution_result,
-            reporting_result=reporting_result,
             overall_success=overall_success
         )
     
-    def _get_result(self, context: AgentContext, result_type):
-        """Extract specific result type from context history."""
-        for result in context.history:
-            if isinstance(result, result_type):
-                return result
-        return None
-    
     def _build_system_prompt(self, context: AgentContext) -> str:
         """Build the system prompt for learning."""
-        return f"""You are a learning agent for the {context.domain} domain.
-
-Your task is to analyze workflow executions and extract insights that can improve future performance.
-
-Consider:
-- What patterns emerge across executions?
-- Are detection thresholds appropriate?
-- Are certain problem types consistently resolved?
-- Are there recurring failures or issues?
-- What can be improved in future executions?
-
-Respond with a JSON object in this format:
-{{
-    "insights": [
-        {{
-            "id": "insight-id",
-            "type": "detection|analysis|planning|execution|general",
-            "description": "description of the insight",
-            "confidence": 0.0-1.0
-        }}
-    ],
-    "patterns_found": 0,
-    "recommendations": ["list of recommendations for improvement"],
-    "confidence": 0.0-1.0,
-    "summary": "brief summary of learning analysis"
-}}"""
+        return _learning_system_prompt(context.domain)
     
     def _build_user_message(
         self,
         context: AgentContext,
         current_metrics: ExecutionMetric,
-        historical_metrics: List[ExecutionMetric]
+        historical_metrics: List[MetricSummary]
     ) -> str:
         """Build the user message with execution metrics."""
-        message = f"""Domain: {context.domain}
+        parts = [f"""Domain: {context.domain}
 
 ## Current Execution
 Workflow ID: {current_metrics.workflow_id}
 Success: {current_metrics.overall_success}
 
-"""
+"""]
         
         # Add current execution details
         if current_metrics.detection_result:
-            message += f"""Detection:
+            parts.append(f"""Detection:
 - Problems found: {len(current_metrics.detection_result.problems)}
 - Confidence: {current_metrics.detection_result.confidence}
 
-"""
+""")
         
         if current_metrics.execution_result:
-            message += f"""Execution:
+            parts.append(f"""Execution:
 - Actions executed: {len(current_metrics.execution_result.actions_executed)}
 - Success rate: {current_metrics.execution_result.success_count}/{len(current_metrics.execution_result.actions_executed)}
 
-"""
+""")
         
         # Add historical context if available
         if historical_metrics:
-            message += f"""## Historical Executions ({len(historical_metrics)} recent)
+            parts.append(f"""## Historical Executions ({len(historical_metrics)} recent)
 
-"""
-            for i, metric in enumerate(historical_metrics, 1):
-                success_str = "✓" if metric.overall_success else "✗"
-                problems = len(metric.detection_result.problems) if metric.detection_result else 0
-                message += f"""{i}. {metric.workflow_id} {success_str}
+""")
+            rows = [
+                (
+                    metric.workflow_id,
+                    "✓" if metric.overall_success else "✗",
+                    metric.problem_count,
+                    metric.overall_success
+                )
+                for metric in historical_metrics
+            ]
+            parts.append("".join(
+                f"""{i}. {workflow_id} {success_str}
    - Problems detected: {problems}
-   - Overall success: {metric.overall_success}
+   - Overall success: {success}
 """
+                for i, (workflow_id, success_str, problems, success) in enumerate(rows, 1)
+            ))
         
-        message += "\nAnalyze these executions and provide learning insights and recommendations."
+        parts.append("\nAnalyze these executions and provide learning insights and recommendations.")
         
-        return message
+        return "".join(parts)
@@ -1,10 +1,12 @@
 """Planning agent implementation."""
 
-import json
-import uuid
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
 
 from daperl.core.agents import BasePlanningAgent
+from daperl.core.ids import new_ids
 from daperl.core.models import (
     AgentContext,
     PlanningResult,
@@ -12,8 +14,124 @@ from daperl.core.models import (
     ExecutionPlan,
     Action,
 )
+from daperl.core.serialization import (
+    PROBLEM_LIST_ADAPTER,
+    context_data_block,
+    dumps_compact,
+)
 from daperl.llm.base import LLMMessage
 
+# Severities that never call for remediation, so planning can skip the LLM.
+# Must match the severities the detection prompt asks for.
+_NON_ACTIONABLE_SEVERITIES = frozenset({"info"})
+
+
+class PlannedActionSpec(BaseModel):
+    """An action as returned by the planning LLM."""
+    
+    id: Optional[str] = None
+    action_type: str
+    description: str
+    target: str
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    confidence: float = Field(default=0.7, ge=0.0, le=1.0)
+    requires_approval: bool = True
+    depends_on: List[str] = Field(default_factory=list)
+
+
+class PlanSpec(BaseModel):
+    """A plan as returned by the planning LLM."""
+    
+    id: Optional[str] = None
+    actions: List[PlannedActionSpec]
+    estimated_duration: Optional[str] = None
+    risk_level: str = "medium"
+    requires_approval: bool = True
+    
+    def to_plan(self) -> ExecutionPlan:
+        """
+        Convert the validated plan into an execution plan.
+        
+        Fields were already validated when the response was parsed, so the
+        plan and its actions are built without validating them again.
+        
+        Returns:
+            The execution plan, with ids generated for any the LLM left out
+        """
+        # Generate ids for the plan and any actions without one in one batch
+        missing = sum(1 for action in self.actions if not action.id)
+        generated_ids = iter(new_ids(missing + (not self.id)))
+        
+        actions = [
+            Action.model_construct(
+                id=action.id or next(generated_ids),
+                action_type=action.action_type,
+                description=action.description,
+                target=action.target,
+                parameters=action.parameters,
+                confidence=action.confidence,
+                requires_approval=action.requires_approval,
+                depends_on=action.depends_on
+            )
+            for action in self.actions
+        ]
+        
+        return ExecutionPlan.model_construct(
+            id=self.id or next(generated_ids),
+            actions=actions,
+            estimated_duration=self.estimated_duration,
+            risk_level=self.risk_level,
+            requires_approval=self.requires_approval
+        )
+
+
+class PlanningLLMResponse(BaseModel):
+    """Expected shape of the planning LLM response."""
+    
+    plan: PlanSpec
+    alternatives: List[PlanSpec] = Field(default_factory=list)
+    confidence: float = Field(ge=0.0, le=1.0)
+    summary: str = "Planning complete"
+
+
+@lru_cache(maxsize=32)
+def _planning_system_prompt(domain: str) -> str:
+    """Build the planning system prompt, which only depends on the domain."""
+    return f"""You are a planning agent for the {domain} domain.
+
+Your task is to create an execution plan to address the analyzed problems.
+
+Respond with a JSON object in this format:
+{{
+    "plan": {{
+        "id": "plan-id",
+        "actions": [
+            {{
+                "id": "action-id",
+                "action_type": "type_of_action",
+                "description": "what this action does",
+                "target": "what/who this action targets",
+                "parameters": {{}},
+                "confidence": 0.0-1.0,
+                "requires_approval": true/false,
+                "depends_on": ["ids of actions that must complete first"]
+            }}
+        ],
+        "estimated_duration": "estimated time",
+        "risk_level": "low|medium|high",
+        "requires_approval": true/false
+    }},
+    "alternatives": [],  // optional alternative plans
+    "confidence": 0.0-1.0,
+    "summary": "brief summary of the plan"
+}}
+
+Consider:
+- What actions are needed to fix the problems
+- The order of actions
+- Dependencies between actions (actions without dependencies may run in parallel)
+- Risk level and approval requirements"""
+
 
 class PlanningAgent(BasePlanningAgent):
     """
@@ -22,6 +140,8 @@ class PlanningAgent(BasePlanningAgent):
     This is a generic implementation that can be extended for specific domains.
     """
     
+    __slots__ = ()
+    
     async def execute(self, context: AgentContext) -> PlanningResult:
         """
         Create an execution plan based on analysis.
@@ -36,7 +156,7 @@ class PlanningAgent(BasePlanningAgent):
             raise ValueError("LLM client not configured for PlanningAgent")
         
         # Get analysis results from history
-        analysis_result = self._get_analysis_result(context)
+        analysis_result = context.get_result(AnalysisResult)
         if not analysis_result or not analysis_result.analyzed_problems:
             return PlanningResult(
                 success=True,
@@ -46,40 +166,42 @@ class PlanningAgent(BasePlanningAgent):
                 planning_summary="No problems found, no planning needed"
             )
         
+        if all(p.severity in _NON_ACTIONABLE_SEVERITIES for p in analysis_result.analyzed_problems):
+            return PlanningResult(
+                success=True,
+                message="No actionable problems to plan for",
+                confidence=1.0,
+                confidence_level="very_high",
+                planning_summary="Only informational problems found, no planning needed"
+            )
+        
         # Build planning prompt
         system_prompt = self._build_system_prompt(context)
         user_message = self._build_user_message(context, analysis_result)
         
         messages = [LLMMessage(role="user", content=user_message)]
         
-        # Get plan from LLM
-        response = await self.llm_client.complete_with_json(
-            messages=messages,
-            system_prompt=system_prompt
-        )
-        
-        # Validate and parse response
-        if not self.validate_output(response):
-            raise ValueError(f"Invalid planning output: {response}")
-        
-        # Parse the plan
-        plan = self._parse_plan(response.get("plan", {}))
-        
-        # Parse alternatives
-        alternatives = []
-        for alt in response.get("alternatives", []):
-            alternatives.append(self._parse_plan(alt))
+        # Get plan from LLM, parsed and validated in one pass
+        try:
+            response = await self._complete_json(
+                messages,
+                system_prompt,
+                PlanningLLMResponse
+            )
+        except ValidationError as e:
+            raise ValueError(f"Invalid planning output: {e}") from e
         
-        confidence = response.get("confidence", 0.7)
+        plan = response.plan.to_plan()
+        alternatives = [alt.to_plan() for alt in response.alternatives]
         
         return PlanningResult(
             success=True,
             message=f"Plan created with {len(plan.actions)} actions",
-            confidence=confidence,
-            confidence_level=self._get_confidence_level(confidence),
+            confidence=response.confidence,
+            confidence_level=self._get_confidence_level(response.confidence),
             plan=plan,
             alternatives=alternatives,
-            planning_summary=response.get("summary", "Planning complete")
+            planning_summary=response.summary
         )
     
     def validate_output(self, output: Any) -> bool:
@@ -92,98 +214,19 @@ class PlanningAgent(BasePlanningAgent):
         Returns:
             True if valid, False otherwise
         """
-        if not isinstance(output, dict):
-            return False
-        
-        if "plan" not in output or "confidence" not in output:
-            return False
-        
-        plan = output["plan"]
-        if not isinstance(plan, dict) or "actions" not in plan:
-            return False
-        
-        if not isinstance(plan["actions"], list):
+        try:
+            PlanningLLMResponse.model_validate(output)
+        except ValidationError:
             return False
-        
-        # Validate each action has required fields
-        for action in plan["actions"]:
-            if not isinstance(action, dict):
-                return False
-            required_fields = ["action_type", "description", "target"]
-            if not all(field in action for field in required_fields):
-                return False
-        
         return True
     
-    def _parse_plan(self, plan_data: dict) -> ExecutionPlan:
-        """Parse plan data into ExecutionPlan model."""
-        actions = []
-        for action_data in plan_data.get("actions", []):
-            action = Action(
-                id=action_data.get("id", str(uuid.uuid4())),
-                action_type=action_data.get("action_type", "unknown"),
-                description=action_data.get("description", ""),
-                target=action_data.get("target", ""),
-                parameters=action_data.get("parameters", {}),
-                confidence=action_data.get("confidence", 0.7),
-                requires_approval=action_data.get("requires_approval", True)
-            )
-            actions.append(action)
-        
-        return ExecutionPlan(
-            id=plan_data.get("id", str(uuid.uuid4())),
-            actions=actions,
-            estimated_duration=plan_data.get("estimated_duration"),
-            risk_level=plan_data.get("risk_level", "medium"),
-            requires_approval=plan_data.get("requires_approval", True)
-        )
-    
-    def _get_analysis_result(self, context: AgentContext) -> AnalysisResult:
-        """Extract analysis result from context history."""
-        for result in context.history:
-            if isinstance(result, AnalysisResult):
-                return result
-        return None
-    
     def _build_system_prompt(self, context: AgentContext) -> str:
         """Build the system prompt for planning."""
-        return f"""You are a planning agent for the {context.domain} domain.
-
-Your task is to create an execution plan to address the analyzed problems.
-
-Respond with a JSON object in this format:
-{{
-    "plan": {{
-        "id": "plan-id",
-        "actions": [
-            {{
-                "id": "action-id",
-                "action_type": "type_of_action",
-                "description": "what this action does",
-                "target": "what/who this action targets",
-                "parameters": {{}},
-                "confidence": 0.0-1.0,
-                "requires_approval": true/false
-            }}
-        ],
-        "estimated_duration": "estimated time",
-        "risk_level": "low|medium|high",
-        "requires_approval": true/false
-    }},
-    "alternatives": [],  // optional alternative plans
-    "confidence": 0.0-1.0,
-    "summary": "brief summary of the plan"
-}}
-
-Consider:
-- What actions are needed to fix the problems
-- The order of actions
-- Dependencies between actions
-- Risk level and approval requirements"""
+        return _planning_system_prompt(context.domain)
     
     def _build_user_message(self, context: AgentContext, analysis_result: AnalysisResult) -> str:
         """Build the user message with analysis results."""
-        problems_str = json.dumps([p.model_dump() for p in analysis_result.analyzed_problems], indent=2)
+        problems_str = PROBLEM_LIST_ADAPTER.dump_json(analysis_result.analyzed_problems).decode()
         
         message = f"""Domain: {context.domain}
 
@@ -191,19 +234,19 @@ Problems:
 {problems_str}
 
 Root Causes:
-{json.dumps(analysis_result.root_causes, indent=2)}
+{dumps_compact(analysis_result.root_causes)}
 
 Recommendations:
-{json.dumps(analysis_result.recommendations, indent=2)}
+{dumps_compact(analysis_result.recommendations)}
 
 Context Data:
-{json.dumps(context.data, indent=2)}
+{context_data_block(context)}
 
 Create a detailed execution plan to address these problems."""
         
         # Include any available tools/actions from config
         if "available_actions" in context.config:
-            message += f"\n\nAvailable Actions:\n{json.dumps(context.config['available_actions'], indent=2)}"
+            message += f"\n\nAvailable Actions:\n{dumps_compact(context.config['available_actions'])}"
         
         # Include any domain-specific instructions from config
         if "planning_instructions" in context.config:
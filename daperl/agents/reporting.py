@@ -1,7 +1,9 @@
 """Reporting agent implementation."""
 
-import json
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field, ValidationError
 
 from daperl.core.agents import BaseReportingAgent
 from daperl.core.models import (
@@ -12,8 +14,52 @@ from daperl.core.models import (
     PlanningResult,
     ExecutionResult,
 )
+from daperl.core.serialization import (
+    ACTION_RESULT_LIST_ADAPTER,
+    PROBLEM_LIST_ADAPTER,
+    dumps_compact,
+)
 from daperl.llm.base import LLMMessage
 
+# Report used when no phase found or did anything, without calling the LLM
+_EMPTY_REPORT = """# Workflow Report
+
+No problems were detected and no actions were executed."""
+
+
+class ReportingLLMResponse(BaseModel):
+    """Expected shape of the reporting LLM response."""
+    
+    report: str
+    metrics: Dict[str, Any]
+    recommendations: List[str] = Field(default_factory=list)
+    confidence: float = Field(ge=0.0, le=1.0)
+
+
+@lru_cache(maxsize=32)
+def _reporting_system_prompt(domain: str) -> str:
+    """Build the reporting system prompt, which only depends on the domain."""
+    return f"""You are a reporting agent for the {domain} domain.
+
+Your task is to generate a comprehensive report of the DAPERL workflow execution,
+including what was detected, analyzed, planned, and executed.
+
+Respond with a JSON object in this format:
+{{
+    "report": "A comprehensive markdown-formatted report of the entire workflow",
+    "metrics": {{
+        "problems_detected": 0,
+        "problems_resolved": 0,
+        "actions_executed": 0,
+        "success_rate": 0.0,
+        "total_duration": "duration string"
+    }},
+    "recommendations": ["list of recommendations for future improvements"],
+    "confidence": 0.0-1.0
+}}
+
+The report should be clear, concise, and actionable."""
+
 
 class ReportingAgent(BaseReportingAgent):
     """
@@ -22,6 +68,8 @@ class ReportingAgent(BaseReportingAgent):
     This is a generic implementation that can be extended for specific domains.
     """
     
+    __slots__ = ()
+    
     async def execute(self, context: AgentContext) -> ReportingResult:
         """
         Generate a report of the workflow execution.
@@ -32,15 +80,32 @@ class ReportingAgent(BaseReportingAgent):
         Returns:
             Reporting result with summary and metrics
         """
+        # Gather results from all phases
+        detection_result = context.get_result(DetectionResult)
+        analysis_result = context.get_result(AnalysisResult)
+        planning_result = context.get_result(PlanningResult)
+        execution_result = context.get_result(ExecutionResult)
+        
+        # Nothing was found or done, so there is nothing for the LLM to summarize
+        no_problems = not detection_result or not detection_result.problems
+        no_actions = not execution_result or not execution_result.actions_executed
+        if no_problems and no_actions:
+            return ReportingResult(
+                success=True,
+                message="Nothing to report",
+                confidence=1.0,
+                confidence_level="very_high",
+                report=_EMPTY_REPORT,
+                metrics={
+                    "problems_detected": 0,
+                    "problems_resolved": 0,
+                    "actions_executed": 0
+                }
+            )
+        
         if not self.llm_client:
             raise ValueError("LLM client not configured for ReportingAgent")
         
-        # Gather results from all phases
-        detection_result = self._get_result(context, DetectionResult)
-        analysis_result = self._get_result(context, AnalysisResult)
-        planning_result = self._get_result(context, PlanningResult)
-        execution_result = self._get_result(context, ExecutionResult)
-        
         # Build reporting prompt
         system_prompt = self._build_system_prompt(context)
         user_message = self._build_user_message(
@@ -53,26 +118,24 @@ class ReportingAgent(BaseReportingAgent):
         
         messages = [LLMMessage(role="user", content=user_message)]
         
-        # Get report from LLM
-        response = await self.llm_client.complete_with_json(
-            messages=messages,
-            system_prompt=system_prompt
-        )
-        
-        # Validate and parse response
-        if not self.validate_output(response):
-            raise ValueError(f"Invalid reporting output: {response}")
-        
-        confidence = response.get("confidence", 0.8)
+        # Get report from LLM, parsed and validated in one pass
+        try:
+            response = await self._complete_json(
+                messages,
+                system_prompt,
+                ReportingLLMResponse
+            )
+        except ValidationError as e:
+            raise ValueError(f"Invalid reporting output: {e}") from e
         
         return ReportingResult(
             success=True,
             message="Report generated successfully",
-            confidence=confidence,
-            confidence_level=self._get_confidence_level(confidence),
-            report=response.get("report", ""),
-            metrics=response.get("metrics", {}),
-            recommendations=response.get("recommendations", [])
+            confidence=response.confidence,
+            confidence_level=self._get_confidence_level(response.confidence),
+            report=response.report,
+            metrics=response.metrics,
+            recommendations=response.recommendations
         )
     
     def validate_output(self, output: Any) -> bool:
@@ -85,48 +148,15 @@ class ReportingAgent(BaseReportingAgent):
         Returns:
             True if valid, False otherwise
         """
-        if not isinstance(output, dict):
+        try:
+            ReportingLLMResponse.model_validate(output)
+        except ValidationError:
             return False
-        
-        required_fields = ["report", "metrics", "confidence"]
-        for field in required_fields:
-            if field not in output:
-                return False
-        
-        if not isinstance(output["metrics"], dict):
-            return False
-        
         return True
     
-    def _get_result(self, context: AgentContext, result_type):
-        """Extract specific result type from context history."""
-        for result in context.history:
-            if isinstance(result, result_type):
-                return result
-        return None
-    
     def _build_system_prompt(self, context: AgentContext) -> str:
         """Build the system prompt for reporting."""
-        return f"""You are a reporting agent for the {context.domain} domain.
-
-Your task is to generate a comprehensive report of the DAPERL workflow execution,
-including what was detected, analyzed, planned, and executed.
-
-Respond with a JSON object in this format:
-{{
-    "report": "A comprehensive markdown-formatted report of the entire workflow",
-    "metrics": {{
-        "problems_detected": 0,
-        "problems_resolved": 0,
-        "actions_executed": 0,
-        "success_rate": 0.0,
-        "total_duration": "duration string"
-    }},
-    "recommendations": ["list of recommendations for future improvements"],
-    "confidence": 0.0-1.0
-}}
-
-The report should be clear, concise, and actionable."""
+        return _reporting_system_prompt(context.domain)
     
     def _build_user_message(
         self,
@@ -137,53 +167,53 @@ The report should be clear, concise, and actionable."""
         execution_result: ExecutionResult
     ) -> str:
         """Build the user message with all phase results."""
-        message = f"""Domain: {context.domain}
+        parts = [f"""Domain: {context.domain}
 Workflow ID: {context.workflow_id}
 
-"""
+"""]
         
         # Detection phase
         if detection_result:
-            message += f"""## Detection Phase
+            parts.append(f"""## Detection Phase
 - Problems detected: {len(detection_result.problems)}
 - Confidence: {detection_result.confidence}
 - Summary: {detection_result.summary}
 
 Problems:
-{json.dumps([p.model_dump() for p in detection_result.problems], indent=2)}
+{PROBLEM_LIST_ADAPTER.dump_json(detection_result.problems).decode()}
 
-"""
+""")
         
         # Analysis phase
         if analysis_result:
-            message += f"""## Analysis Phase
+            parts.append(f"""## Analysis Phase
 - Root causes identified: {len(analysis_result.root_causes)}
 - Confidence: {analysis_result.confidence}
 - Summary: {analysis_result.analysis_summary}
 
 Root Causes:
-{json.dumps(analysis_result.root_causes, indent=2)}
+{dumps_compact(analysis_result.root_causes)}
 
 Recommendations:
-{json.dumps(analysis_result.recommendations, indent=2)}
+{dumps_compact(analysis_result.recommendations)}
 
-"""
+""")
         
         # Planning phase
         if planning_result and planning_result.plan:
-            message += f"""## Planning Phase
+            parts.append(f"""## Planning Phase
 - Actions planned: {len(planning_result.plan.actions)}
 - Confidence: {planning_result.confidence}
 - Summary: {planning_result.planning_summary}
 
 Plan:
-{json.dumps(planning_result.plan.model_dump(), indent=2)}
+{planning_result.plan.model_dump_json()}
 
-"""
+""")
         
         # Execution phase
         if execution_result:
-            message += f"""## Execution Phase
+            parts.append(f"""## Execution Phase
 - Actions executed: {len(execution_result.actions_executed)}
 - Successful: {execution_result.success_count}
 - Failed: {execution_result.failure_count}
@@ -191,10 +221,10 @@ Plan:
 - Summary: {execution_result.execution_summary}
 
 Action Results:
-{json.dumps([a.model_dump() for a in execution_result.actions_executed], indent=2)}
+{ACTION_RESULT_LIST_ADAPTER.dump_json(execution_result.actions_executed).decode()}
 
-"""
+""")
         
-        message += "\nGenerate a comprehensive report of this workflow execution."
+        parts.append("\nGenerate a comprehensive report of this workflow execution.")
         
-        return message
+        return "".join(parts)
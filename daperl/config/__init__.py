@@ -5,6 +5,7 @@ from daperl.config.settings import (
     LLMConfig,
     TemporalConfig,
     DAPERLConfig,
+    get_settings,
 )
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "LLMConfig",
     "TemporalConfig",
     "DAPERLConfig",
+    "get_settings",
 ]
@@ -1,25 +1,44 @@
 """Settings and configuration for the DAPERL framework."""
 
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+import sys
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+from dotenv import dotenv_values
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from pydantic.fields import FieldInfo
+from pydantic_settings import (
+    BaseSettings,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+
+# Agents with their own LLM settings. Each name has matching
+# "<name>_llm_provider/_model/_temperature/_max_tokens" settings fields and a
+# "<name>_llm" field on DAPERLConfig.
+AGENT_NAMES = ("detection", "analysis", "planning", "execution", "reporting", "learning")
 
 
 class LLMConfig(BaseModel):
     """Configuration for LLM client."""
     
+    model_config = ConfigDict(frozen=True)
+    
     provider: str = "openai"  # "openai", "anthropic", "litellm"
     model: str = "gpt-4o"
     api_key: Optional[str] = None
     temperature: float = 0.7
     max_tokens: int = 4000
     timeout: int = 60
+    stream_json: bool = False  # Stream JSON completions, returning once the JSON closes
     additional_params: Dict[str, Any] = Field(default_factory=dict)
 
 
 class TemporalConfig(BaseModel):
     """Configuration for Temporal connection."""
     
+    model_config = ConfigDict(frozen=True)
+    
     host: str = "localhost:7233"
     namespace: str = "default"
     task_queue: str = "daperl-task-queue"
@@ -28,66 +47,175 @@ class TemporalConfig(BaseModel):
 class LearningConfig(BaseModel):
     """Configuration for learning storage."""
     
+    model_config = ConfigDict(frozen=True)
+    
     storage_type: str = "json"  # "json", "sqlite", "postgresql"
     storage_path: str = "./data/learning.json"
 
 
+# Default per-agent LLM configs. LLMConfig is frozen, so every DAPERLConfig
+# built without explicit configs shares these instances. They are returned
+# from default factories because pydantic deep-copies plain model defaults.
+_DEFAULT_DETECTION_LLM = LLMConfig(
+    provider="openai",
+    model="gpt-3.5-turbo",
+    temperature=0.3,
+    max_tokens=2000
+)
+
+_DEFAULT_ANALYSIS_LLM = LLMConfig(
+    provider="openai",
+    model="gpt-4o",
+    temperature=0.5,
+    max_tokens=4000
+)
+
+_DEFAULT_PLANNING_LLM = LLMConfig(
+    provider="anthropic",
+    model="claude-3-5-sonnet-20241022",
+    temperature=0.7,
+    max_tokens=8000
+)
+
+_DEFAULT_EXECUTION_LLM = LLMConfig(
+    provider="openai",
+    model="gpt-4o",
+    temperature=0.2,
+    max_tokens=4000
+)
+
+_DEFAULT_REPORTING_LLM = LLMConfig(
+    provider="openai",
+    model="gpt-3.5-turbo",
+    temperature=0.7,
+    max_tokens=3000
+)
+
+_DEFAULT_LEARNING_LLM = LLMConfig(
+    provider="openai",
+    model="gpt-4o",
+    temperature=0.5,
+    max_tokens=4000
+)
+
+
 class DAPERLConfig(BaseModel):
     """Configuration for DAPERL workflow agents."""
     
-    detection_llm: LLMConfig = Field(
-        default_factory=lambda: LLMConfig(
-            provider="openai",
-            model="gpt-3.5-turbo",
-            temperature=0.3,
-            max_tokens=2000
-        )
-    )
+    model_config = ConfigDict(frozen=True)
     
-    analysis_llm: LLMConfig = Field(
-        default_factory=lambda: LLMConfig(
-            provider="openai",
-            model="gpt-4o",
-            temperature=0.5,
-            max_tokens=4000
-        )
-    )
+    detection_llm: LLMConfig = Field(default_factory=lambda: _DEFAULT_DETECTION_LLM)
+    analysis_llm: LLMConfig = Field(default_factory=lambda: _DEFAULT_ANALYSIS_LLM)
+    planning_llm: LLMConfig = Field(default_factory=lambda: _DEFAULT_PLANNING_LLM)
+    execution_llm: LLMConfig = Field(default_factory=lambda: _DEFAULT_EXECUTION_LLM)
+    reporting_llm: LLMConfig = Field(default_factory=lambda: _DEFAULT_REPORTING_LLM)
+    learning_llm: LLMConfig = Field(default_factory=lambda: _DEFAULT_LEARNING_LLM)
+
+
+@lru_cache(maxsize=32)
+def _make_llm_config(
+    provider: str,
+    model: str,
+    api_key: Optional[str],
+    temperature: float,
+    max_tokens: int,
+    stream_json: bool = False
+) -> LLMConfig:
+    """
+    Build an LLM configuration from already-validated settings values.
     
-    planning_llm: LLMConfig = Field(
-        default_factory=lambda: LLMConfig(
-            provider="anthropic",
-            model="claude-3-5-sonnet-20241022",
-            temperature=0.7,
-            max_tokens=8000
-        )
-    )
+    LLMConfig is frozen, so agents with identical settings share one instance.
     
-    execution_llm: LLMConfig = Field(
-        default_factory=lambda: LLMConfig(
-            provider="openai",
-            model="gpt-4o",
-            temperature=0.2,
-            max_tokens=4000
-        )
+    Args:
+        provider: The LLM provider name
+        model: The model name
+        api_key: The provider API key, if any
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        stream_json: Whether to stream JSON completions
+        
+    Returns:
+        The (possibly shared) LLM configuration
+    """
+    return LLMConfig.model_construct(
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream_json=stream_json
     )
+
+
+@lru_cache(maxsize=8)
+def _env_aliases(settings_cls: Type[BaseSettings]) -> Dict[str, str]:
+    """Lower-cased environment variable name -> field alias, built once per class."""
+    return {
+        (field.alias or name).lower(): field.alias or name
+        for name, field in settings_cls.model_fields.items()
+    }
+
+
+@lru_cache(maxsize=8)
+def _dotenv_snapshot(path: str, encoding: Optional[str]) -> Dict[str, str]:
+    """
+    Parse a dotenv file once per process.
     
-    reporting_llm: LLMConfig = Field(
-        default_factory=lambda: LLMConfig(
-            provider="openai",
-            model="gpt-3.5-turbo",
-            temperature=0.7,
-            max_tokens=3000
-        )
-    )
+    Args:
+        path: Absolute path of the dotenv file
+        encoding: File encoding
+        
+    Returns:
+        The variables set in the file; empty if the file does not exist
+    """
+    if not os.path.isfile(path):
+        return {}
+    return {
+        key: value
+        for key, value in dotenv_values(path, encoding=encoding).items()
+        if value is not None
+    }
+
+
+class _EnvMappingSource(PydanticBaseSettingsSource):
+    """
+    Settings source that reads every field from the environment in one scan.
     
-    learning_llm: LLMConfig = Field(
-        default_factory=lambda: LLMConfig(
-            provider="openai",
-            model="gpt-4o",
-            temperature=0.5,
-            max_tokens=4000
-        )
-    )
+    The configured dotenv files are parsed once per process and overlaid with
+    os.environ, so environment variables still take precedence over .env.
+    Each variable is matched case-insensitively against a precomputed alias
+    table and passed through as a string; pydantic validation coerces it to
+    the field type as usual. Only flat fields are supported, which is all
+    Settings declares.
+    """
+    
+    def get_field_value(self, field: FieldInfo, field_name: str) -> Tuple[Any, str, bool]:
+        """Unused; all values are resolved together in __call__."""
+        return None, field_name, False
+    
+    def __call__(self) -> Dict[str, Any]:
+        """Collect the values of all known dotenv and environment variables."""
+        aliases = _env_aliases(self.settings_cls)
+        values = {}
+        for source in (*self._dotenv_snapshots(), os.environ):
+            for key, value in source.items():
+                alias = aliases.get(key.lower())
+                if alias is not None:
+                    values[alias] = value
+        return values
+    
+    def _dotenv_snapshots(self) -> List[Dict[str, str]]:
+        """Parsed dotenv files in load order; later files override earlier ones."""
+        env_files = self.config.get("env_file")
+        if env_files is None:
+            return []
+        if isinstance(env_files, (str, os.PathLike)):
+            env_files = [env_files]
+        encoding = self.config.get("env_file_encoding")
+        return [
+            _dotenv_snapshot(os.path.abspath(env_file), encoding)
+            for env_file in env_files
+        ]
 
 
 class Settings(BaseSettings):
@@ -147,6 +275,9 @@ class Settings(BaseSettings):
     learning_llm_temperature: float = Field(default=0.5, alias="LEARNING_LLM_TEMPERATURE")
     learning_llm_max_tokens: int = Field(default=4000, alias="LEARNING_LLM_MAX_TOKENS")
     
+    # Stream JSON completions for all agents
+    llm_stream_json: bool = Field(default=False, alias="LLM_STREAM_JSON")
+    
     # API Keys
     openai_api_key: Optional[str] = Field(default=None, alias="OPENAI_API_KEY")
     anthropic_api_key: Optional[str] = Field(default=None, alias="ANTHROPIC_API_KEY")
@@ -158,76 +289,156 @@ class Settings(BaseSettings):
     # MCP Server
     mcp_server_name: str = Field(default="daperl-server", alias="MCP_SERVER_NAME")
     
+    # Concurrency
+    max_parallel_agents: int = Field(default=4, alias="MAX_PARALLEL_AGENTS")
+    max_parallel_actions: int = Field(default=4, alias="MAX_PARALLEL_ACTIONS")
+    
+    # Semantic Cache (detection)
+    semantic_cache_enabled: bool = Field(default=False, alias="SEMANTIC_CACHE_ENABLED")
+    semantic_cache_threshold: float = Field(default=0.95, alias="SEMANTIC_CACHE_THRESHOLD")
+    semantic_cache_embedding_model: str = Field(
+        default="text-embedding-3-small", alias="SEMANTIC_CACHE_EMBEDDING_MODEL"
+    )
+    semantic_cache_max_entries: int = Field(default=256, alias="SEMANTIC_CACHE_MAX_ENTRIES")
+    
+    # Phase Result Cache (detection, analysis, planning)
+    phase_cache_enabled: bool = Field(default=False, alias="PHASE_CACHE_ENABLED")
+    phase_cache_path: str = Field(default="./data/phase_cache", alias="PHASE_CACHE_PATH")
+    phase_cache_ttl_seconds: float = Field(default=3600, alias="PHASE_CACHE_TTL_SECONDS")
+    
+    # Phase Snapshots (let a rerun of a workflow skip its finished phases)
+    phase_snapshot_path: str = Field(default="./data/phase_snapshots", alias="PHASE_SNAPSHOT_PATH")
+    phase_snapshot_ttl_seconds: float = Field(default=86400, alias="PHASE_SNAPSHOT_TTL_SECONDS")
+    
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        """
+        Read the environment and the cached .env contents in a single scan
+        instead of per-field lookups.
+        """
+        return (
+            init_settings,
+            _EnvMappingSource(settings_cls),
+            file_secret_settings,
+        )
+    
+    # Derived configs, built on first use. Settings do not change after load,
+    # so every caller shares the same instances until refresh() is called.
+    _temporal_config: Optional[TemporalConfig] = PrivateAttr(default=None)
+    _daperl_config: Optional[DAPERLConfig] = PrivateAttr(default=None)
+    _learning_config: Optional[LearningConfig] = PrivateAttr(default=None)
+    
+    def refresh(self) -> None:
+        """Drop the cached derived configs so the next call rebuilds them."""
+        self._temporal_config = None
+        self._daperl_config = None
+        self._learning_config = None
+    
     def get_temporal_config(self) -> TemporalConfig:
         """Get Temporal configuration."""
+        if self._temporal_config is None:
+            self._temporal_config = self._build_temporal_config()
+        return self._temporal_config
+    
+    def get_daperl_config(self) -> DAPERLConfig:
+        """Get DAPERL configuration with per-agent LLM configs."""
+        if self._daperl_config is None:
+            self._daperl_config = self._build_daperl_config()
+        return self._daperl_config
+    
+    def get_learning_config(self) -> LearningConfig:
+        """Get learning storage configuration."""
+        if self._learning_config is None:
+            self._learning_config = self._build_learning_config()
+        return self._learning_config
+    
+    def _build_temporal_config(self) -> TemporalConfig:
+        """Build the Temporal configuration."""
         return TemporalConfig(
             host=self.temporal_host,
             namespace=self.temporal_namespace,
             task_queue=self.temporal_task_queue
         )
     
-    def get_daperl_config(self) -> DAPERLConfig:
-        """Get DAPERL configuration with per-agent LLM configs."""
-        return DAPERLConfig(
-            detection_llm=LLMConfig(
-                provider=self.detection_llm_provider,
-                model=self.detection_llm_model,
-                api_key=self._get_api_key(self.detection_llm_provider),
-                temperature=self.detection_llm_temperature,
-                max_tokens=self.detection_llm_max_tokens
-            ),
-            analysis_llm=LLMConfig(
-                provider=self.analysis_llm_provider,
-                model=self.analysis_llm_model,
-                api_key=self._get_api_key(self.analysis_llm_provider),
-                temperature=self.analysis_llm_temperature,
-                max_tokens=self.analysis_llm_max_tokens
-            ),
-            planning_llm=LLMConfig(
-                provider=self.planning_llm_provider,
-                model=self.planning_llm_model,
-                api_key=self._get_api_key(self.planning_llm_provider),
-                temperature=self.planning_llm_temperature,
-                max_tokens=self.planning_llm_max_tokens
-            ),
-            execution_llm=LLMConfig(
-                provider=self.execution_llm_provider,
-                model=self.execution_llm_model,
-                api_key=self._get_api_key(self.execution_llm_provider),
-                temperature=self.execution_llm_temperature,
-                max_tokens=self.execution_llm_max_tokens
-            ),
-            reporting_llm=LLMConfig(
-                provider=self.reporting_llm_provider,
-                model=self.reporting_llm_model,
-                api_key=self._get_api_key(self.reporting_llm_provider),
-                temperature=self.reporting_llm_temperature,
-                max_tokens=self.reporting_llm_max_tokens
-            ),
-            learning_llm=LLMConfig(
-                provider=self.learning_llm_provider,
-                model=self.learning_llm_model,
-                api_key=self._get_api_key(self.learning_llm_provider),
-                temperature=self.learning_llm_temperature,
-                max_tokens=self.learning_llm_max_tokens
-            )
+    def _build_daperl_config(self) -> DAPERLConfig:
+        """Build the DAPERL configuration with per-agent LLM configs."""
+        # Values come from already-validated settings fields, so skip
+        # re-validating them
+        return DAPERLConfig.model_construct(**{
+            f"{agent}_llm": self._build_agent_llm_config(agent) for agent in AGENT_NAMES
+        })
+    
+    def _build_agent_llm_config(self, agent: str) -> LLMConfig:
+        """
+        Build the LLM configuration for one agent from its settings fields.
+        
+        Args:
+            agent: The agent name, e.g. "detection"
+            
+        Returns:
+            The agent's LLM configuration
+        """
+        # Interned so every config shares one object per provider/model name
+        provider = sys.intern(getattr(self, f"{agent}_llm_provider"))
+        return _make_llm_config(
+            provider,
+            sys.intern(getattr(self, f"{agent}_llm_model")),
+            self._get_api_key(provider),
+            getattr(self, f"{agent}_llm_temperature"),
+            getattr(self, f"{agent}_llm_max_tokens"),
+            self.llm_stream_json
         )
     
-    def get_learning_config(self) -> LearningConfig:
-        """Get learning storage configuration."""
+    def _build_learning_config(self) -> LearningConfig:
+        """Build the learning storage configuration."""
         return LearningConfig(
             storage_type=self.learning_storage_type,
             storage_path=self.learning_storage_path
         )
     
+    @cached_property
+    def _api_key_map(self) -> Dict[str, Optional[str]]:
+        """API keys by provider name, built once per Settings instance."""
+        return {
+            "openai": self.openai_api_key,
+            "anthropic": self.anthropic_api_key,
+        }
+    
     def _get_api_key(self, provider: str) -> Optional[str]:
         """Get API key for the specified provider."""
-        if provider == "openai":
-            return self.openai_api_key
-        elif provider == "anthropic":
-            return self.anthropic_api_key
-        return None
+        return self._api_key_map.get(provider)
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the global settings instance, loading it on first use.
+    
+    Loading reads the .env file and every environment variable, so it is
+    deferred until something needs the settings rather than done at import.
+    Call get_settings.cache_clear() to load them again.
+    
+    Returns:
+        The shared Settings instance
+    """
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Resolve the module-level ``settings`` lazily via get_settings().
+    
+    Kept for code that imports ``settings``. Such an import loads the
+    settings and keeps that instance across reloads, so DAPERL's own entry
+    points call get_settings() where the settings are used instead.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
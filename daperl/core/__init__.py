@@ -1,27 +1,31 @@
 """Core abstractions for the DAPERL framework."""
 
-from daperl.core.types import AgentPhase, WorkflowStatus
-from daperl.core.models import (
-    AgentContext,
-    AgentResult,
-    DetectionResult,
-    AnalysisResult,
-    PlanningResult,
-    ExecutionResult,
-    ReportingResult,
-    LearningResult,
-    DAPERLInput,
-    DAPERLResult,
-)
-from daperl.core.agents import (
-    BaseAgent,
-    BaseDetectionAgent,
-    BaseAnalysisAgent,
-    BasePlanningAgent,
-    BaseExecutionAgent,
-    BaseReportingAgent,
-    BaseLearningAgent,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from daperl.core.types import AgentPhase, WorkflowStatus
+    from daperl.core.models import (
+        AgentContext,
+        AgentResult,
+        DetectionResult,
+        AnalysisResult,
+        PlanningResult,
+        ExecutionResult,
+        ReportingResult,
+        LearningResult,
+        DAPERLInput,
+        DAPERLResult,
+    )
+    from daperl.core.agents import (
+        BaseAgent,
+        BaseDetectionAgent,
+        BaseAnalysisAgent,
+        BasePlanningAgent,
+        BaseExecutionAgent,
+        BaseReportingAgent,
+        BaseLearningAgent,
+    )
 
 __all__ = [
     "AgentPhase",
@@ -44,3 +48,38 @@ __all__ = [
     "BaseReportingAgent",
     "BaseLearningAgent",
 ]
+
+# Public name -> defining submodule. Submodules are imported on first access,
+# so importing e.g. AgentPhase does not pull in the agent base classes and,
+# through them, the LLM clients and settings.
+_EXPORTS = {
+    "AgentPhase": "daperl.core.types",
+    "WorkflowStatus": "daperl.core.types",
+    "AgentContext": "daperl.core.models",
+    "AgentResult": "daperl.core.models",
+    "DetectionResult": "daperl.core.models",
+    "AnalysisResult": "daperl.core.models",
+    "PlanningResult": "daperl.core.models",
+    "ExecutionResult": "daperl.core.models",
+    "ReportingResult": "daperl.core.models",
+    "LearningResult": "daperl.core.models",
+    "DAPERLInput": "daperl.core.models",
+    "DAPERLResult": "daperl.core.models",
+    "BaseAgent": "daperl.core.agents",
+    "BaseDetectionAgent": "daperl.core.agents",
+    "BaseAnalysisAgent": "daperl.core.agents",
+    "BasePlanningAgent": "daperl.core.agents",
+    "BaseExecutionAgent": "daperl.core.agents",
+    "BaseReportingAgent": "daperl.core.agents",
+    "BaseLearningAgent": "daperl.core.agents",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,7 +1,11 @@
 """Base agent classes for the DAPERL framework."""
 
+import inspect
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from bisect import bisect_right
+from typing import Any, Awaitable, List, Optional, Type, TypeVar, Union
+
+from pydantic import BaseModel
 
 from daperl.core.models import (
     AgentContext,
@@ -13,13 +17,34 @@ from daperl.core.models import (
     ReportingResult,
     LearningResult,
 )
-from daperl.llm.base import BaseLLMClient
+from daperl.llm.base import BaseLLMClient, LLMMessage
 from daperl.config.settings import LLMConfig
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_LLMFactory = None
+
+
+def _llm_factory():
+    """Import the LLM factory on first use and reuse it afterwards."""
+    global _LLMFactory
+    if _LLMFactory is None:
+        from daperl.llm.factory import LLMFactory
+        _LLMFactory = LLMFactory
+    return _LLMFactory
+
 
 class BaseAgent(ABC):
     """Abstract base class for all DAPERL agents."""
     
+    # Concrete agents that add attributes of their own get a __dict__ unless
+    # they declare __slots__ too
+    __slots__ = ("llm_client", "llm_config")
+    
+    # Lower bounds of each confidence level above "low"
+    _CONFIDENCE_THRESHOLDS = (0.5, 0.7, 0.9)
+    _CONFIDENCE_LEVELS = ("low", "medium", "high", "very_high")
+    
     def __init__(
         self,
         llm_client: Optional[BaseLLMClient] = None,
@@ -37,22 +62,40 @@ class BaseAgent(ABC):
         
         # Lazy initialization of LLM client
         if self.llm_client is None and self.llm_config is not None:
-            from daperl.llm.factory import LLMFactory
-            self.llm_client = LLMFactory.create(self.llm_config)
+            self.llm_client = _llm_factory().create(self.llm_config)
     
     @abstractmethod
-    async def execute(self, context: AgentContext) -> AgentResult:
+    def execute(self, context: AgentContext) -> Union[AgentResult, Awaitable[AgentResult]]:
         """
         Execute the agent's logic.
         
+        Overrides may be plain or async functions. Agents that only transform
+        data in memory can return their result directly and skip creating a
+        coroutine; callers should go through run(), which handles both.
+        
         Args:
             context: The agent context with shared state
             
         Returns:
-            The result of the agent's execution
+            The result of the agent's execution, or an awaitable of it
         """
         pass
     
+    async def run(self, context: AgentContext) -> AgentResult:
+        """
+        Execute the agent, awaiting the result if execute is async.
+        
+        Args:
+            context: The agent context with shared state
+            
+        Returns:
+            The result of the agent's execution
+        """
+        result = self.execute(context)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    
     @abstractmethod
     def validate_output(self, output: Any) -> bool:
         """
@@ -66,23 +109,57 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def _complete_json(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: str,
+        response_model: Type[ModelT],
+        **kwargs
+    ) -> ModelT:
+        """
+        Get a JSON completion parsed into a model.
+        
+        The raw JSON text is parsed and validated in a single pass by the
+        response model. Clients configured with stream_json stream the
+        response and stop once the JSON closes.
+        
+        Args:
+            messages: Messages in the conversation
+            system_prompt: System prompt for the call
+            response_model: Pydantic model describing the expected response
+            **kwargs: Additional parameters passed to the LLM client
+            
+        Returns:
+            The validated response
+            
+        Raises:
+            ValidationError: If the response does not match the model
+        """
+        complete = (
+            self.llm_client.complete_with_json_raw_stream
+            if self.llm_client.stream_json
+            else self.llm_client.complete_with_json_raw
+        )
+        raw = await complete(
+            messages=messages,
+            system_prompt=system_prompt,
+            **kwargs
+        )
+        return response_model.model_validate_json(raw)
+    
     def _get_confidence_level(self, confidence: float) -> str:
         """Convert numeric confidence to level."""
-        if confidence >= 0.9:
-            return "very_high"
-        elif confidence >= 0.7:
-            return "high"
-        elif confidence >= 0.5:
-            return "medium"
-        else:
-            return "low"
+        # bisect_right puts a score equal to a threshold in the level above it
+        return self._CONFIDENCE_LEVELS[bisect_right(self._CONFIDENCE_THRESHOLDS, confidence)]
 
 
 class BaseDetectionAgent(BaseAgent):
     """Base class for detection agents."""
     
+    __slots__ = ()
+    
     @abstractmethod
-    async def execute(self, context: AgentContext) -> DetectionResult:
+    def execute(self, context: AgentContext) -> Union[DetectionResult, Awaitable[DetectionResult]]:
         """
         Detect problems in the given context.
         
@@ -98,8 +175,10 @@ class BaseDetectionAgent(BaseAgent):
 class BaseAnalysisAgent(BaseAgent):
     """Base class for analysis agents."""
     
+    __slots__ = ()
+    
     @abstractmethod
-    async def execute(self, context: AgentContext) -> AnalysisResult:
+    def execute(self, context: AgentContext) -> Union[AnalysisResult, Awaitable[AnalysisResult]]:
         """
         Analyze detected problems.
         
@@ -115,8 +194,10 @@ class BaseAnalysisAgent(BaseAgent):
 class BasePlanningAgent(BaseAgent):
     """Base class for planning agents."""
     
+    __slots__ = ()
+    
     @abstractmethod
-    async def execute(self, context: AgentContext) -> PlanningResult:
+    def execute(self, context: AgentContext) -> Union[PlanningResult, Awaitable[PlanningResult]]:
         """
         Create an execution plan based on analysis.
         
@@ -132,8 +213,10 @@ class BasePlanningAgent(BaseAgent):
 class BaseExecutionAgent(BaseAgent):
     """Base class for execution agents."""
     
+    __slots__ = ()
+    
     @abstractmethod
-    async def execute(self, context: AgentContext) -> ExecutionResult:
+    def execute(self, context: AgentContext) -> Union[ExecutionResult, Awaitable[ExecutionResult]]:
         """
         Execute the planned actions.
         
@@ -149,8 +232,10 @@ class BaseExecutionAgent(BaseAgent):
 class BaseReportingAgent(BaseAgent):
     """Base class for reporting agents."""
     
+    __slots__ = ()
+    
     @abstractmethod
-    async def execute(self, context: AgentContext) -> ReportingResult:
+    def execute(self, context: AgentContext) -> Union[ReportingResult, Awaitable[ReportingResult]]:
         """
         Generate a report of the workflow execution.
         
@@ -166,8 +251,10 @@ class BaseReportingAgent(BaseAgent):
 class BaseLearningAgent(BaseAgent):
     """Base class for learning agents."""
     
+    __slots__ = ()
+    
     @abstractmethod
-    async def execute(self, context: AgentContext) -> LearningResult:
+    def execute(self, context: AgentContext) -> Union[LearningResult, Awaitable[LearningResult]]:
         """
         Learn from the workflow execution.
         
@@ -1,26 +1,96 @@
 """Data models for the DAPERL framework."""
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from typing import Annotated, Any, Dict, List, Literal, Optional, Type, TypeVar, Union
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from daperl.core.types import AgentPhase, WorkflowStatus, ConfidenceLevel
 
+ResultT = TypeVar("ResultT", bound="AgentResult")
+
+
+def _utcnow() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
 
 class AgentContext(BaseModel):
     """Shared context passed between agents."""
     
     workflow_id: str
+    run_id: Optional[str] = None
     domain: str
     data: Dict[str, Any] = Field(default_factory=dict)
-    history: List["AgentResult"] = Field(default_factory=list)
+    history: List["PhaseResult"] = Field(default_factory=list)
     config: Dict[str, Any] = Field(default_factory=dict)
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    # Result class -> position of its latest result in history, for every
+    # class from a result's own type up to AgentResult
+    _history_index: Dict[type, int] = PrivateAttr(default_factory=dict)
+    # Number of history entries covered by _history_index
+    _indexed_count: int = PrivateAttr(default=0)
+    
+    def add_result(self, result: "AgentResult") -> None:
+        """
+        Append a result to the history and index it by its types.
+        
+        Args:
+            result: The agent result to record
+        """
+        self.history.append(result)
+        if self._indexed_count == len(self.history) - 1:
+            self._index_result(len(self.history) - 1, result)
+        else:
+            self._rebuild_history_index()
+    
+    def get_result(self, result_type: Type[ResultT]) -> Optional[ResultT]:
+        """
+        Look up the latest result of a given type, or of a subclass of it.
+        
+        Args:
+            result_type: The result class to look up
+            
+        Returns:
+            The result, or None if no result of that type has been recorded
+        """
+        # History changed other than through add_result (e.g. appended to
+        # directly, or deserialized); re-index it in a single pass
+        if self._indexed_count != len(self.history):
+            self._rebuild_history_index()
+        
+        index = self._history_index.get(result_type)
+        if index is not None:
+            result = self.history[index]
+            if isinstance(result, result_type):
+                return result
+        
+        # Types outside the AgentResult hierarchy, or entries replaced in place
+        for result in reversed(self.history):
+            if isinstance(result, result_type):
+                return result
+        return None
+    
+    def _index_result(self, position: int, result: "AgentResult") -> None:
+        """Index one history entry under its own type and its base classes."""
+        for cls in type(result).__mro__:
+            self._history_index[cls] = position
+            if cls is AgentResult:
+                break
+        self._indexed_count = position + 1
+    
+    def _rebuild_history_index(self) -> None:
+        """Index the whole history from scratch."""
+        self._history_index = {}
+        self._indexed_count = 0
+        for position, result in enumerate(self.history):
+            self._index_result(position, result)
 
 
 class AgentResult(BaseModel):
     """Base result from an agent."""
     
+    model_config = ConfigDict(extra="forbid")
+    
     phase: AgentPhase
     success: bool
     message: str
@@ -28,23 +98,25 @@ class AgentResult(BaseModel):
     confidence_level: ConfidenceLevel
     data: Dict[str, Any] = Field(default_factory=dict)
     error: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 class Problem(BaseModel):
     """Represents a detected problem."""
     
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     id: str
     type: str
     description: str
-    severity: str  # "low", "medium", "high", "critical"
+    severity: str  # "info", "low", "medium", "high", "critical"
     data: Dict[str, Any] = Field(default_factory=dict)
 
 
 class DetectionResult(AgentResult):
     """Result from the detection agent."""
     
-    phase: AgentPhase = AgentPhase.DETECTION
+    phase: Literal[AgentPhase.DETECTION] = AgentPhase.DETECTION
     problems_detected: bool = False
     problems: List[Problem] = Field(default_factory=list)
     summary: str = ""
@@ -53,7 +125,7 @@ class DetectionResult(AgentResult):
 class AnalysisResult(AgentResult):
     """Result from the analysis agent."""
     
-    phase: AgentPhase = AgentPhase.ANALYSIS
+    phase: Literal[AgentPhase.ANALYSIS] = AgentPhase.ANALYSIS
     analyzed_problems: List[Problem] = Field(default_factory=list)
     root_causes: List[str] = Field(default_factory=list)
     recommendations: List[str] = Field(default_factory=list)
@@ -63,6 +135,8 @@ class AnalysisResult(AgentResult):
 class Action(BaseModel):
     """Represents a planned action."""
     
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     id: str
     action_type: str
     description: str
@@ -70,6 +144,7 @@ class Action(BaseModel):
     parameters: Dict[str, Any] = Field(default_factory=dict)
     confidence: float = Field(ge=0.0, le=1.0)
     requires_approval: bool = True
+    depends_on: List[str] = Field(default_factory=list)
 
 
 class ExecutionPlan(BaseModel):
@@ -85,7 +160,7 @@ class ExecutionPlan(BaseModel):
 class PlanningResult(AgentResult):
     """Result from the planning agent."""
     
-    phase: AgentPhase = AgentPhase.PLANNING
+    phase: Literal[AgentPhase.PLANNING] = AgentPhase.PLANNING
     plan: Optional[ExecutionPlan] = None
     alternatives: List[ExecutionPlan] = Field(default_factory=list)
     planning_summary: str = ""
@@ -94,6 +169,8 @@ class PlanningResult(AgentResult):
 class ActionResult(BaseModel):
     """Result from executing an action."""
     
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     action_id: str
     success: bool
     message: str
@@ -104,7 +181,7 @@ class ActionResult(BaseModel):
 class ExecutionResult(AgentResult):
     """Result from the execution agent."""
     
-    phase: AgentPhase = AgentPhase.EXECUTION
+    phase: Literal[AgentPhase.EXECUTION] = AgentPhase.EXECUTION
     plan_id: str
     actions_executed: List[ActionResult] = Field(default_factory=list)
     success_count: int = 0
@@ -115,48 +192,120 @@ class ExecutionResult(AgentResult):
 class ReportingResult(AgentResult):
     """Result from the reporting agent."""
     
-    phase: AgentPhase = AgentPhase.REPORTING
+    phase: Literal[AgentPhase.REPORTING] = AgentPhase.REPORTING
     report: str
     metrics: Dict[str, Any] = Field(default_factory=dict)
     recommendations: List[str] = Field(default_factory=list)
 
 
+class MetricSummary(BaseModel):
+    """
+    The scalar fields of an execution metric.
+    
+    Scans over many past executions only need these, so they can skip
+    validating the nested phase results of each full metric.
+    """
+    
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
+    workflow_id: str
+    run_id: Optional[str] = None
+    timestamp: datetime
+    domain: str
+    overall_success: bool
+    problem_count: int = 0
+    total_duration_seconds: Optional[float] = None
+
+
 class ExecutionMetric(BaseModel):
-    """Metrics from a workflow execution."""
+    """
+    Metrics from a workflow execution.
+    
+    Learning runs alongside reporting, so metrics carry no reporting result.
+    Records stored before that change still have a reporting_result key,
+    which is ignored when they are loaded.
+    """
     
     workflow_id: str
+    run_id: Optional[str] = None
     timestamp: datetime
     domain: str
     detection_result: Optional[DetectionResult] = None
     analysis_result: Optional[AnalysisResult] = None
     planning_result: Optional[PlanningResult] = None
     execution_result: Optional[ExecutionResult] = None
-    reporting_result: Optional[ReportingResult] = None
     overall_success: bool
     total_duration_seconds: Optional[float] = None
+    
+    def summary(self) -> MetricSummary:
+        """
+        Build the summary record of this metric.
+        
+        Returns:
+            The metric's scalar fields
+        """
+        return MetricSummary(
+            workflow_id=self.workflow_id,
+            run_id=self.run_id,
+            timestamp=self.timestamp,
+            domain=self.domain,
+            overall_success=self.overall_success,
+            problem_count=len(self.detection_result.problems) if self.detection_result else 0,
+            total_duration_seconds=self.total_duration_seconds
+        )
 
 
 class LearningInsight(BaseModel):
     """An insight learned from past executions."""
     
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     id: str
     insight_type: str
     description: str
     confidence: float = Field(ge=0.0, le=1.0)
     supporting_executions: List[str] = Field(default_factory=list)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
 
 
 class LearningResult(AgentResult):
     """Result from the learning agent."""
     
-    phase: AgentPhase = AgentPhase.LEARNING
+    phase: Literal[AgentPhase.LEARNING] = AgentPhase.LEARNING
     insights: List[LearningInsight] = Field(default_factory=list)
     patterns_found: int = 0
     recommendations: List[str] = Field(default_factory=list)
     learning_summary: str = ""
 
 
+# Any phase result. Each class only accepts its own "phase" tag and forbids
+# extra fields, so exactly one variant matches a serialized result. Use this
+# for activity type hints: Temporal's default converter tries the variants in
+# turn but cannot decode the Annotated form below.
+AnyPhaseResult = Union[
+    DetectionResult,
+    AnalysisResult,
+    PlanningResult,
+    ExecutionResult,
+    ReportingResult,
+    LearningResult,
+]
+
+# Any phase result, told apart by its "phase" tag. Validating a serialized
+# context (e.g. an activity input) dispatches each history entry straight to
+# its result class instead of trying every variant or falling back to the
+# AgentResult base class.
+PhaseResult = Annotated[AnyPhaseResult, Field(discriminator="phase")]
+
+
+class CombinedDAPResult(BaseModel):
+    """Results of detection, analysis and planning run in a single activity."""
+    
+    detection_result: DetectionResult
+    analysis_result: Optional[AnalysisResult] = None
+    planning_result: Optional[PlanningResult] = None
+
+
 class DAPERLInput(BaseModel):
     """Input to the DAPERL workflow."""
     
@@ -0,0 +1,75 @@
+"""JSON serialization helpers for building LLM prompts."""
+
+from typing import Any, List
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+from daperl.core.models import ActionResult, AgentContext, Problem
+
+# Upper bound on serialized context data embedded in a single prompt
+MAX_DATA_CHARS = 50_000
+
+# Serialize whole lists of models in one pydantic-core call, without building
+# intermediate dicts
+PROBLEM_LIST_ADAPTER = TypeAdapter(List[Problem])
+ACTION_RESULT_LIST_ADAPTER = TypeAdapter(List[ActionResult])
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects orjson does not support natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps_compact(obj: Any) -> str:
+    """
+    Serialize an object to a compact JSON string.
+    
+    Prompts are read by the LLM, not by people, so no indentation is added;
+    indenting roughly doubles the payload size and its input tokens.
+    
+    Pydantic models are serialized directly, so lists of models do not need
+    an intermediate list of dicts.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        Compact JSON string
+    """
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def dumps_truncated(obj: Any, max_chars: int = MAX_DATA_CHARS) -> str:
+    """
+    Serialize an object like dumps_compact, cutting the output at max_chars.
+    
+    Keeps very large context data from inflating prompt size and LLM input
+    tokens. Truncated output is no longer valid JSON and is marked as such.
+    
+    Args:
+        obj: The object to serialize
+        max_chars: Maximum number of characters to keep
+        
+    Returns:
+        JSON string, truncated with a marker if it was too long
+    """
+    text = dumps_compact(obj)
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars] + "\n...[truncated]"
+
+
+def context_data_block(context: AgentContext) -> str:
+    """
+    Serialize the context data for a prompt.
+    
+    Args:
+        context: The agent context whose data to serialize
+        
+    Returns:
+        The serialized (and possibly truncated) data block
+    """
+    return dumps_truncated(context.data)
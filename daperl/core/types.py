@@ -26,6 +26,7 @@ class WorkflowStatus(str, Enum):
     EXECUTING = "EXECUTING"
     REPORTING = "REPORTING"
     LEARNING = "LEARNING"
+    FINALIZING = "FINALIZING"  # Reporting and learning running together
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
     CANCELLED = "CANCELLED"
@@ -1,10 +1,37 @@
 """LLM provider abstraction for the DAPERL framework."""
 
-from daperl.llm.base import BaseLLMClient, LLMResponse
-from daperl.llm.factory import LLMFactory
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from daperl.llm.base import BaseLLMClient, LLMResponse
+    from daperl.llm.factory import LLMFactory
+    from daperl.llm.cache import SemanticCache, SemanticKey
 
 __all__ = [
     "BaseLLMClient",
     "LLMResponse",
     "LLMFactory",
+    "SemanticCache",
+    "SemanticKey",
 ]
+
+# Public name -> defining submodule. Submodules are imported on first access,
+# so importing daperl.llm.base does not pull in LiteLLM through the factory.
+_EXPORTS = {
+    "BaseLLMClient": "daperl.llm.base",
+    "LLMResponse": "daperl.llm.base",
+    "LLMFactory": "daperl.llm.factory",
+    "SemanticCache": "daperl.llm.cache",
+    "SemanticKey": "daperl.llm.cache",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -2,6 +2,8 @@
 
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
+
+import orjson
 from pydantic import BaseModel
 
 
@@ -10,6 +12,7 @@ class LLMMessage(BaseModel):
     
     role: str  # "system", "user", "assistant"
     content: str
+    cache_control: Optional[Dict[str, str]] = None  # e.g. {"type": "ephemeral"}
 
 
 class LLMResponse(BaseModel):
@@ -31,6 +34,7 @@ class BaseLLMClient(ABC):
         temperature: float = 0.7,
         max_tokens: int = 4000,
         timeout: int = 60,
+        stream_json: bool = False,
         **kwargs
     ):
         """
@@ -42,6 +46,7 @@ class BaseLLMClient(ABC):
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             timeout: Request timeout in seconds
+            stream_json: Stream JSON completions, returning once the JSON closes
             **kwargs: Additional provider-specific parameters
         """
         self.model = model
@@ -49,6 +54,7 @@ class BaseLLMClient(ABC):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.timeout = timeout
+        self.stream_json = stream_json
         self.kwargs = kwargs
     
     @abstractmethod
@@ -90,3 +96,50 @@ class BaseLLMClient(ABC):
             Parsed JSON response
         """
         pass
+    
+    async def complete_with_json_raw(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate a JSON completion and return the unparsed JSON text.
+        
+        Callers that validate the response with a Pydantic model can parse
+        this directly with model_validate_json, skipping the intermediate dict.
+        Providers should override this; the default re-serializes the result
+        of complete_with_json.
+        
+        Args:
+            messages: List of messages in the conversation
+            system_prompt: Optional system prompt to prepend
+            **kwargs: Additional parameters for this specific call
+            
+        Returns:
+            JSON text of the response
+        """
+        response = await self.complete_with_json(messages, system_prompt, **kwargs)
+        return orjson.dumps(response).decode()
+    
+    async def complete_with_json_raw_stream(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate a JSON completion, returning as soon as the JSON is complete.
+        
+        Providers that can stream should override this to scan the response
+        while it arrives; the default waits for complete_with_json_raw.
+        
+        Args:
+            messages: List of messages in the conversation
+            system_prompt: Optional system prompt to prepend
+            **kwargs: Additional parameters for this specific call
+            
+        Returns:
+            JSON text of the response
+        """
+        return await self.complete_with_json_raw(messages, system_prompt, **kwargs)
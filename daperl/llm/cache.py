@@ -0,0 +1,131 @@
+"""Caching for LLM responses."""
+
+import hashlib
+import logging
+import math
+import operator
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticKey(NamedTuple):
+    """Where a prompt's response is stored, as returned by SemanticCache.lookup()."""
+    
+    namespace: str
+    embedding: List[float]
+
+
+class SemanticCache:
+    """
+    Embedding-based cache that matches near-duplicate prompts.
+    
+    Prompts are embedded and compared by cosine similarity against previously
+    answered prompts in the same namespace (e.g. system prompt and model). A
+    match above the threshold returns the earlier response. The index is
+    bounded and evicts the least recently used entry.
+    
+    Only the first max_input_chars characters of a prompt are embedded, which
+    keeps the input within the embedding model's limit. The rest of a longer
+    prompt must match exactly: its hash becomes part of the namespace.
+    """
+    
+    def __init__(
+        self,
+        embedding_model: str = "text-embedding-3-small",
+        threshold: float = 0.95,
+        max_entries: int = 256,
+        api_key: Optional[str] = None,
+        max_input_chars: int = 8000
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            embedding_model: LiteLLM embedding model used to embed prompts
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of entries kept
+            api_key: API key for the embedding provider; LiteLLM falls back
+                to the provider's environment variable when not set
+            max_input_chars: Longest prompt prefix that is embedded
+        """
+        self.embedding_model = embedding_model
+        self.api_key = api_key
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_input_chars = max_input_chars
+        self._entries: "OrderedDict[int, Tuple[str, List[float], str]]" = OrderedDict()
+        self._next_id = 0
+    
+    async def embed(self, text: str) -> List[float]:
+        """Embed text as a unit-length vector."""
+        # Imported here so LiteLLM is only loaded when the cache is enabled
+        from litellm import aembedding
+        
+        params = {"api_key": self.api_key} if self.api_key else {}
+        response = await aembedding(model=self.embedding_model, input=[text], **params)
+        vector = response.data[0]["embedding"]
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+    
+    async def lookup(
+        self,
+        namespace: str,
+        text: str
+    ) -> Tuple[Optional[str], Optional[SemanticKey]]:
+        """
+        Find a cached response for a semantically equivalent prompt.
+        
+        Args:
+            namespace: Only entries stored under this namespace are compared
+            text: The prompt to look up
+            
+        Returns:
+            Tuple of (cached JSON text or None, key of the prompt). The key is
+            None if the prompt could not be embedded and should be passed to
+            add() after a miss.
+        """
+        if len(text) > self.max_input_chars:
+            tail = text[self.max_input_chars:]
+            namespace = f"{namespace}\0{hashlib.sha256(tail.encode()).hexdigest()}"
+            text = text[:self.max_input_chars]
+        
+        try:
+            embedding = await self.embed(text)
+        except Exception as e:
+            # The cache is an optimization; never fail the caller over it
+            logger.warning("Semantic cache lookup skipped, embedding failed: %s", e)
+            return None, None
+        key = SemanticKey(namespace, embedding)
+        
+        best_id, best_score = None, self.threshold
+        for entry_id, (entry_namespace, vector, _) in self._entries.items():
+            if entry_namespace != namespace:
+                continue
+            score = sum(map(operator.mul, embedding, vector))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        
+        if best_id is None:
+            return None, key
+        
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][2], key
+    
+    def add(self, key: SemanticKey, response: str) -> None:
+        """
+        Store a response for a prompt.
+        
+        Args:
+            key: Key of the prompt, as returned by lookup()
+            response: JSON text of the response to cache
+        """
+        self._entries[self._next_id] = (key.namespace, key.embedding, response)
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
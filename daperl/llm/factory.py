@@ -1,6 +1,6 @@
 """Factory for creating LLM clients."""
 
-from typing import Optional
+from typing import Dict, Optional
 
 from daperl.config.settings import LLMConfig
 from daperl.llm.base import BaseLLMClient
@@ -10,20 +10,40 @@ from daperl.llm.providers.litellm_provider import LiteLLMClient
 class LLMFactory:
     """Factory for creating LLM clients based on configuration."""
     
-    @staticmethod
-    def create(config: LLMConfig) -> BaseLLMClient:
+    # Clients keep no per-call state, so agents with identical configs share
+    # one client. Keyed by the serialized config, since additional_params
+    # makes LLMConfig itself unhashable.
+    _clients: Dict[str, BaseLLMClient] = {}
+    
+    @classmethod
+    def create(cls, config: LLMConfig) -> BaseLLMClient:
         """
-        Create an LLM client based on the configuration.
+        Get the LLM client for a configuration, creating it on first use.
         
         Args:
             config: LLM configuration
             
         Returns:
-            Configured LLM client
+            Configured LLM client, shared by all callers with an equal config
             
         Raises:
             ValueError: If the provider is not supported
         """
+        key = config.model_dump_json()
+        client = cls._clients.get(key)
+        if client is None:
+            client = cls._build(config)
+            cls._clients[key] = client
+        return client
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all shared clients so the next create() builds new ones."""
+        cls._clients.clear()
+    
+    @staticmethod
+    def _build(config: LLMConfig) -> BaseLLMClient:
+        """Build a new LLM client for the configuration."""
         # For now, we use LiteLLM for all providers as it supports multiple providers
         # This gives us flexibility to add provider-specific clients later if needed
         
@@ -37,6 +57,7 @@ class LLMFactory:
             temperature=config.temperature,
             max_tokens=config.max_tokens,
             timeout=config.timeout,
+            stream_json=config.stream_json,
             **config.additional_params
         )
     
@@ -1,13 +1,46 @@
 """LiteLLM provider implementation for multi-provider support."""
 
-import json
+import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import litellm
+import orjson
 from litellm import acompletion
 
 from daperl.llm.base import BaseLLMClient, LLMMessage, LLMResponse
 
+# A JSON object or array inside a markdown code block, optionally tagged json
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*\}|\[.*\])\s*```", re.S)
+
+_JSON_INSTRUCTION = "\n\nYou must respond with valid JSON only. No other text."
+_DEFAULT_JSON_SYSTEM_PROMPT = "You are a helpful assistant that responds with valid JSON."
+
+# Shared by every JSON request to models that support response_format
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# What may precede streamed JSON on its line, ignoring whitespace: nothing,
+# or an opening markdown code fence
+_JSON_LINE_PREFIXES = ("", "```", "```json")
+
+
+# Errors that interrupt a streamed completion without anything being wrong
+# with the request. Retrying completions is left to the workflow's retry
+# policy, so there is a single retry layer.
+_TRANSIENT_ERRORS = (
+    litellm.RateLimitError,
+    litellm.Timeout,
+    litellm.APIConnectionError,
+    litellm.ServiceUnavailableError,
+    litellm.InternalServerError,
+)
+
+
+@lru_cache(maxsize=128)
+def _augment_system_prompt(system_prompt: Optional[str]) -> str:
+    """Add the JSON-only instruction to a system prompt, once per distinct prompt."""
+    return (system_prompt or _DEFAULT_JSON_SYSTEM_PROMPT) + _JSON_INSTRUCTION
+
 
 class LiteLLMClient(BaseLLMClient):
     """LLM client using LiteLLM for multi-provider support."""
@@ -19,6 +52,7 @@ class LiteLLMClient(BaseLLMClient):
         temperature: float = 0.7,
         max_tokens: int = 4000,
         timeout: int = 60,
+        stream_json: bool = False,
         **kwargs
     ):
         """
@@ -30,20 +64,26 @@ class LiteLLMClient(BaseLLMClient):
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             timeout: Request timeout in seconds
+            stream_json: Stream JSON completions, returning once the JSON closes
             **kwargs: Additional provider-specific parameters
         """
-        super().__init__(model, api_key, temperature, max_tokens, timeout, **kwargs)
+        super().__init__(model, api_key, temperature, max_tokens, timeout, stream_json, **kwargs)
         
-        # Set API key in environment if provided
+        # Parameters sent with every request, merged once instead of per call
+        self._base_params = {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "timeout": timeout,
+            **kwargs,
+        }
+        # Passed per request rather than exported to os.environ, so clients
+        # with different keys do not overwrite each other's credentials
         if api_key:
-            # LiteLLM will automatically detect the provider from the model name
-            # and use the appropriate environment variable
-            if "gpt" in model or "o1" in model:
-                import os
-                os.environ["OPENAI_API_KEY"] = api_key
-            elif "claude" in model:
-                import os
-                os.environ["ANTHROPIC_API_KEY"] = api_key
+            self._base_params["api_key"] = api_key
+        
+        # Some models support response_format parameter
+        self._supports_response_format = "gpt" in model or "o1" in model
     
     async def complete(
         self,
@@ -57,35 +97,15 @@ class LiteLLMClient(BaseLLMClient):
         Args:
             messages: List of messages in the conversation
             system_prompt: Optional system prompt to prepend
-            **kwargs: Additional parameters for this specific call
+            **kwargs: Additional parameters for this specific call. Pass
+                cache_system_prompt=True to mark a static system prompt as a
+                cacheable prefix for providers that support prompt caching.
             
         Returns:
             LLM response with generated content
         """
-        # Convert messages to dict format
-        formatted_messages = []
-        
-        if system_prompt:
-            formatted_messages.append({"role": "system", "content": system_prompt})
-        
-        for msg in messages:
-            formatted_messages.append({"role": msg.role, "content": msg.content})
-        
-        # Merge kwargs with defaults
-        params = {
-            "model": self.model,
-            "messages": formatted_messages,
-            "temperature": kwargs.get("temperature", self.temperature),
-            "max_tokens": kwargs.get("max_tokens", self.max_tokens),
-            "timeout": kwargs.get("timeout", self.timeout),
-        }
-        
-        # Add any additional parameters
-        params.update({k: v for k, v in self.kwargs.items()})
-        params.update({k: v for k, v in kwargs.items() if k not in params})
-        
         # Call LiteLLM
-        response = await acompletion(**params)
+        response = await acompletion(**self._request_params(messages, system_prompt, kwargs))
         
         # Extract response
         content = response.choices[0].message.content
@@ -106,6 +126,46 @@ class LiteLLMClient(BaseLLMClient):
             metadata={"response_id": response.id if hasattr(response, "id") else None}
         )
     
+    def _request_params(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the acompletion parameters for a request."""
+        cache_system_prompt = kwargs.pop("cache_system_prompt", False)
+        
+        if system_prompt:
+            system_message = LLMMessage(
+                role="system",
+                content=system_prompt,
+                cache_control={"type": "ephemeral"} if cache_system_prompt else None
+            )
+            messages = [system_message, *messages]
+        
+        # Convert messages to dict format
+        formatted_messages = [self._format_message(msg) for msg in messages]
+        
+        # Per-call parameters override the client defaults
+        return {**self._base_params, **kwargs, "messages": formatted_messages}
+    
+    def _format_message(self, message: LLMMessage) -> Dict[str, Any]:
+        """Convert a message to the LiteLLM dict format."""
+        # Anthropic needs an explicit cache breakpoint; OpenAI caches long
+        # prompt prefixes automatically
+        if message.cache_control and "claude" in self.model:
+            return {
+                "role": message.role,
+                "content": [
+                    {
+                        "type": "text",
+                        "text": message.content,
+                        "cache_control": message.cache_control,
+                    }
+                ],
+            }
+        return {"role": message.role, "content": message.content}
+    
     async def complete_with_json(
         self,
         messages: List[LLMMessage],
@@ -123,34 +183,183 @@ class LiteLLMClient(BaseLLMClient):
         Returns:
             Parsed JSON response
         """
-        # Add JSON formatting instruction to system prompt
-        json_instruction = "\n\nYou must respond with valid JSON only. No other text."
-        if system_prompt:
-            system_prompt = system_prompt + json_instruction
-        else:
-            system_prompt = "You are a helpful assistant that responds with valid JSON." + json_instruction
-        
-        # Some models support response_format parameter
-        if "gpt" in self.model or "o1" in self.model:
-            kwargs["response_format"] = {"type": "json_object"}
+        content = await self.complete_with_json_raw(messages, system_prompt, **kwargs)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON from LLM response: {e}") from e
+    
+    async def complete_with_json_raw(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate a JSON completion and return the unparsed JSON text.
         
+        Args:
+            messages: List of messages in the conversation
+            system_prompt: Optional system prompt to prepend
+            **kwargs: Additional parameters for this specific call
+            
+        Returns:
+            JSON text with any markdown code fence removed
+        """
+        system_prompt = self._json_system_prompt(system_prompt, kwargs)
         response = await self.complete(messages, system_prompt, **kwargs)
+        return _extract_json(response.content)
+    
+    async def complete_with_json_raw_stream(
+        self,
+        messages: List[LLMMessage],
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate a JSON completion, scanning it while the response streams in.
+        
+        Returns as soon as the top-level JSON value closes instead of waiting
+        for the end of the stream, and closes the stream so the rest of the
+        response is not read. Falls back to a regular completion if the
+        stream is interrupted or ends without a complete JSON value; any
+        other error is raised.
         
-        # Parse JSON from response
+        Args:
+            messages: List of messages in the conversation
+            system_prompt: Optional system prompt to prepend
+            **kwargs: Additional parameters for this specific call
+            
+        Returns:
+            JSON text of the response
+        """
+        stream_kwargs = dict(kwargs)
+        json_system_prompt = self._json_system_prompt(system_prompt, stream_kwargs)
+        params = self._request_params(messages, json_system_prompt, stream_kwargs)
+        
+        scanner = _JSONScanner()
+        content = None
+        stream = await acompletion(**params, stream=True)
         try:
-            return json.loads(response.content)
-        except json.JSONDecodeError as e:
-            # Try to extract JSON from markdown code blocks
-            content = response.content.strip()
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            content = content.strip()
+            async for chunk in stream:
+                content = scanner.feed(chunk.choices[0].delta.content or "")
+                if content is not None:
+                    break
+        except _TRANSIENT_ERRORS:
+            # An interrupted stream is retried below without streaming
+            content = None
+        finally:
+            await stream.aclose()
+        
+        if content is None:
+            return await self.complete_with_json_raw(messages, system_prompt, **kwargs)
+        return content
+    
+    def _json_system_prompt(self, system_prompt: Optional[str], kwargs: Dict[str, Any]) -> str:
+        """
+        Add the JSON-only instruction to a system prompt and request JSON
+        output from models that support it.
+        
+        Args:
+            system_prompt: The caller's system prompt, if any
+            kwargs: Per-call parameters; response_format is added when supported
             
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                raise ValueError(f"Failed to parse JSON from LLM response: {e}") from e
+        Returns:
+            The system prompt to send
+        """
+        if self._supports_response_format:
+            kwargs["response_format"] = _JSON_RESPONSE_FORMAT
+        return _augment_system_prompt(system_prompt)
+
+
+def _extract_json(content: str) -> str:
+    """Return the JSON text of a response, removing a markdown code block if any."""
+    content = content.strip()
+    if content.startswith(("{", "[")):
+        return content
+    
+    # Extract the JSON from a markdown code block, if any
+    match = _JSON_FENCE.search(content)
+    return match.group(1) if match else content
+
+
+class _JSONScanner:
+    """
+    Find the first complete top-level JSON object or array in streamed text.
+    
+    A value may only start at a bracket that begins a line or follows an
+    opening code fence, so brackets in prose before the JSON (e.g. "see [1]")
+    are skipped. Tracks nesting depth and string state across chunks, so
+    each character is looked at once no matter how the text is split; a
+    candidate that closes but does not parse is dropped and scanning resumes
+    after its opening bracket.
+    """
+    
+    def __init__(self):
+        self._parts: List[str] = []
+        self._length = 0
+        self._start: Optional[int] = None
+        self._line_prefix = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, text: str) -> Optional[str]:
+        """
+        Add the next chunk of text.
+        
+        Args:
+            text: The next chunk of the response
+            
+        Returns:
+            The JSON text once the top-level value has closed, otherwise None
+        """
+        offset = self._length
+        self._parts.append(text)
+        self._length += len(text)
+        return self._scan(text, offset)
+    
+    def _scan(self, text: str, offset: int) -> Optional[str]:
+        """Scan text that starts at offset in the buffered response."""
+        for index, char in enumerate(text):
+            if self._start is None:
+                if char in "{[" and self._line_prefix in _JSON_LINE_PREFIXES:
+                    self._start = offset + index
+                    self._depth = 1
+                elif char == "\n":
+                    self._line_prefix = ""
+                elif not char.isspace() and len(self._line_prefix) < 8:
+                    # Only short prefixes can match; longer ones are prose
+                    self._line_prefix += char
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    buffered = "".join(self._parts)
+                    candidate = buffered[self._start:offset + index + 1]
+                    try:
+                        orjson.loads(candidate)
+                    except orjson.JSONDecodeError:
+                        return self._restart(buffered)
+                    return candidate
+        return None
+    
+    def _restart(self, buffered: str) -> Optional[str]:
+        """Drop the current candidate and rescan from just after its opening bracket."""
+        resume = self._start + 1
+        self._start = None
+        self._in_string = False
+        self._escaped = False
+        # The failed bracket now counts as prose on its line
+        self._line_prefix = buffered[resume - 1]
+        return self._scan(buffered[resume:], resume)
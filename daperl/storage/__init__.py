@@ -2,8 +2,11 @@
 
 from daperl.storage.base import BaseLearningStorage
 from daperl.storage.json_storage import JSONLearningStorage
+from daperl.storage.phase_cache import PhaseResultCache, PhaseSnapshotStore
 
 __all__ = [
     "BaseLearningStorage",
     "JSONLearningStorage",
+    "PhaseResultCache",
+    "PhaseSnapshotStore",
 ]
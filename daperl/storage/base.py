@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
-from daperl.core.models import ExecutionMetric, LearningInsight
+from daperl.core.models import ExecutionMetric, LearningInsight, MetricSummary
 
 
 class BaseLearningStorage(ABC):
@@ -19,6 +19,19 @@ class BaseLearningStorage(ABC):
         """
         pass
     
+    async def store_metrics(self, metrics: List[ExecutionMetric]) -> None:
+        """
+        Store several execution metrics at once.
+        
+        The default implementation stores them one by one. Backends that can
+        write a batch in a single operation should override it.
+        
+        Args:
+            metrics: The execution metrics to store
+        """
+        for metric in metrics:
+            await self.store_metric(metric)
+    
     @abstractmethod
     async def get_recent_metrics(self, limit: int = 10) -> List[ExecutionMetric]:
         """
@@ -32,6 +45,21 @@ class BaseLearningStorage(ABC):
         """
         pass
     
+    async def get_recent_summaries(self, limit: int = 10) -> List[MetricSummary]:
+        """
+        Retrieve summaries of recent execution metrics.
+        
+        The default implementation summarizes full metrics. Backends that keep
+        summaries separately should override it.
+        
+        Args:
+            limit: Maximum number of summaries to retrieve
+            
+        Returns:
+            List of recent metric summaries, newest first
+        """
+        return [metric.summary() for metric in await self.get_recent_metrics(limit)]
+    
     @abstractmethod
     async def get_metric(self, workflow_id: str) -> Optional[ExecutionMetric]:
         """
@@ -55,6 +83,19 @@ class BaseLearningStorage(ABC):
         """
         pass
     
+    async def store_insights(self, insights: List[LearningInsight]) -> None:
+        """
+        Store several learning insights at once.
+        
+        The default implementation stores them one by one. Backends that can
+        write a batch in a single operation should override it.
+        
+        Args:
+            insights: The learning insights to store
+        """
+        for insight in insights:
+            await self.store_insight(insight)
+    
     @abstractmethod
     async def get_insights(self, limit: int = 10) -> List[LearningInsight]:
         """
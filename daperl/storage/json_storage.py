@@ -1,17 +1,31 @@
 """JSON file-based storage for learning data."""
 
-import json
 import os
+import threading
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 import asyncio
 
+import orjson
+
 from daperl.storage.base import BaseLearningStorage
-from daperl.core.models import ExecutionMetric, LearningInsight
+from daperl.core.models import ExecutionMetric, LearningInsight, MetricSummary
+
+# Most recent lines per file kept in memory for tail reads
+_TAIL_CACHE_LINES = 128
 
 
 class JSONLearningStorage(BaseLearningStorage):
-    """Simple JSON file-based storage for learning data."""
+    """
+    Simple JSON file-based storage for learning data.
+    
+    Metrics and insights are kept as newline-delimited JSON (one record per
+    line), so storing a record appends a single line instead of rewriting the
+    whole file. A summary of each metric is also appended to a separate file,
+    so scans over recent executions read a few small lines per record.
+    """
     
     def __init__(self, storage_path: str = "./data/learning.json"):
         """
@@ -21,83 +35,191 @@ class JSONLearningStorage(BaseLearningStorage):
             storage_path: Path to the JSON storage file
         """
         self.storage_path = Path(storage_path)
-        self.metrics_path = self.storage_path.parent / "metrics.json"
-        self.insights_path = self.storage_path.parent / "insights.json"
+        self.metrics_path = self.storage_path.parent / "metrics.jsonl"
+        self.insights_path = self.storage_path.parent / "insights.jsonl"
+        self.summaries_path = self.storage_path.parent / "metrics_summary.jsonl"
         
         # Ensure directory exists
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Initialize files if they don't exist
-        if not self.metrics_path.exists():
-            self.metrics_path.write_text("[]")
-        if not self.insights_path.exists():
-            self.insights_path.write_text("[]")
+        # Initialize files if they don't exist, carrying over records from the
+        # earlier single-array JSON files
+        self._init_file(self.metrics_path, self.storage_path.parent / "metrics.json")
+        self._init_file(self.insights_path, self.storage_path.parent / "insights.json")
+        self._init_summaries()
         
-        # Simple lock for concurrent access
-        self._lock = asyncio.Lock()
+        # Path -> (file signature, most recent lines, whether that is every
+        # line in the file). Serves tail reads from memory.
+        self._tails: Dict[Path, Tuple[Tuple[int, int], Deque[str], bool]] = {}
+        
+        # Appends are single O_APPEND writes, so the file itself needs no
+        # lock. This only keeps the tail cache consistent with our own
+        # appends, and is held by worker threads for one write or one read.
+        self._tails_lock = threading.Lock()
     
     async def store_metric(self, metric: ExecutionMetric) -> None:
         """Store an execution metric."""
-        async with self._lock:
-            metrics = await self._read_metrics()
-            metrics.append(metric.model_dump(mode='json'))
-            await self._write_metrics(metrics)
+        await self.store_metrics([metric])
+    
+    async def store_metrics(self, metrics: List[ExecutionMetric]) -> None:
+        """Store several execution metrics with a single append."""
+        if not metrics:
+            return
+        lines = [metric.model_dump_json() for metric in metrics]
+        summary_lines = [metric.summary().model_dump_json() for metric in metrics]
+        await asyncio.to_thread(self._append_metric_lines, lines, summary_lines)
     
     async def get_recent_metrics(self, limit: int = 10) -> List[ExecutionMetric]:
         """Retrieve recent execution metrics."""
-        async with self._lock:
-            metrics_data = await self._read_metrics()
-            recent = metrics_data[-limit:] if len(metrics_data) > limit else metrics_data
-            return [ExecutionMetric(**m) for m in reversed(recent)]
+        lines = await asyncio.to_thread(self._tail_lines, self.metrics_path, limit)
+        return self._parse_lines(ExecutionMetric, reversed(lines))
+    
+    async def get_recent_summaries(self, limit: int = 10) -> List[MetricSummary]:
+        """Retrieve summaries of recent execution metrics."""
+        lines = await asyncio.to_thread(self._tail_lines, self.summaries_path, limit)
+        return self._parse_lines(MetricSummary, reversed(lines))
     
     async def get_metric(self, workflow_id: str) -> Optional[ExecutionMetric]:
         """Retrieve a specific execution metric."""
-        async with self._lock:
-            metrics_data = await self._read_metrics()
-            for m in reversed(metrics_data):
-                if m.get("workflow_id") == workflow_id:
-                    return ExecutionMetric(**m)
-            return None
+        lines = await asyncio.to_thread(self._read_lines, self.metrics_path)
+        
+        # Only parse lines that can contain the id, newest first. The needle
+        # can also match inside a nested payload, so check the record's own
+        # id before validating the whole metric.
+        needle = f'"workflow_id":{orjson.dumps(workflow_id).decode()}'
+        for line in reversed(lines):
+            if needle not in line:
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if not isinstance(record, dict) or record.get("workflow_id") != workflow_id:
+                continue
+            for metric in self._parse_lines(ExecutionMetric, [line]):
+                return metric
+        return None
     
     async def store_insight(self, insight: LearningInsight) -> None:
         """Store a learning insight."""
-        async with self._lock:
-            insights = await self._read_insights()
-            insights.append(insight.model_dump(mode='json'))
-            await self._write_insights(insights)
+        await self.store_insights([insight])
+    
+    async def store_insights(self, insights: List[LearningInsight]) -> None:
+        """Store several learning insights with a single append."""
+        if not insights:
+            return
+        lines = [insight.model_dump_json() for insight in insights]
+        await asyncio.to_thread(self._append_lines, self.insights_path, lines)
     
     async def get_insights(self, limit: int = 10) -> List[LearningInsight]:
         """Retrieve recent learning insights."""
-        async with self._lock:
-            insights_data = await self._read_insights()
-            recent = insights_data[-limit:] if len(insights_data) > limit else insights_data
-            return [LearningInsight(**i) for i in reversed(recent)]
+        lines = await asyncio.to_thread(self._tail_lines, self.insights_path, limit)
+        return self._parse_lines(LearningInsight, reversed(lines))
     
-    async def _read_metrics(self) -> list:
-        """Read metrics from file."""
-        return await asyncio.to_thread(self._read_json, self.metrics_path)
+    @staticmethod
+    def _parse_lines(model, lines: Iterable[str]) -> list:
+        """Parse NDJSON lines into models, skipping lines that are not valid."""
+        records = []
+        for line in lines:
+            try:
+                records.append(model.model_validate_json(line))
+            except ValueError:
+                # e.g. a partial line left by an interrupted write
+                continue
+        return records
     
-    async def _write_metrics(self, metrics: list) -> None:
-        """Write metrics to file."""
-        await asyncio.to_thread(self._write_json, self.metrics_path, metrics)
+    def _init_file(self, path: Path, legacy_path: Path) -> None:
+        """Create an NDJSON file, migrating records from a legacy JSON array file."""
+        if path.exists():
+            return
+        records = []
+        if legacy_path.exists():
+            try:
+                records = orjson.loads(legacy_path.read_bytes())
+            except orjson.JSONDecodeError:
+                records = []
+        with open(path, 'wb') as f:
+            f.writelines(orjson.dumps(record) + b"\n" for record in records)
     
-    async def _read_insights(self) -> list:
-        """Read insights from file."""
-        return await asyncio.to_thread(self._read_json, self.insights_path)
+    def _init_summaries(self) -> None:
+        """Create the summary file from any metrics stored without summaries."""
+        if self.summaries_path.exists():
+            return
+        metrics = self._parse_lines(ExecutionMetric, self._read_lines(self.metrics_path))
+        with open(self.summaries_path, 'w', encoding='utf-8') as f:
+            f.writelines(metric.summary().model_dump_json() + "\n" for metric in metrics)
     
-    async def _write_insights(self, insights: list) -> None:
-        """Write insights to file."""
-        await asyncio.to_thread(self._write_json, self.insights_path, insights)
+    def _append_metric_lines(self, lines: List[str], summary_lines: List[str]) -> None:
+        """Append metric lines and their summary lines synchronously."""
+        self._append_lines(self.metrics_path, lines)
+        self._append_lines(self.summaries_path, summary_lines)
     
-    def _read_json(self, path: Path) -> list:
-        """Read JSON file synchronously."""
-        try:
-            with open(path, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+    def _append_lines(self, path: Path, lines: List[str]) -> None:
+        """Append NDJSON lines to a file synchronously with a single write."""
+        data = "".join(line + "\n" for line in lines).encode('utf-8')
+        with self._tails_lock:
+            signature_before = self._file_signature(path)
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # Start on a fresh line if an interrupted write left a partial one
+                size = os.fstat(fd).st_size
+                if size > 0 and os.pread(fd, 1, size - 1) != b"\n":
+                    data = b"\n" + data
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            
+            # Keep the tail cache in step with our own writes; anything else
+            # touched the file since it was cached, so drop it
+            cached = self._tails.pop(path, None)
+            if cached is not None and cached[0] == signature_before:
+                _, tail, complete = cached
+                complete = complete and len(tail) + len(lines) <= tail.maxlen
+                tail.extend(line + "\n" for line in lines)
+                self._tails[path] = (self._file_signature(path), tail, complete)
+    
+    def _tail_lines(self, path: Path, limit: int) -> List[str]:
+        """
+        Read the last non-empty lines of a file synchronously, oldest first.
+        
+        The most recent lines are kept in memory, so repeated reads of a file
+        that has only been appended to by this instance do no I/O.
+        """
+        if limit <= 0:
             return []
+        with self._tails_lock:
+            signature = self._file_signature(path)
+            if signature is None:
+                return []
+            
+            cached = self._tails.get(path)
+            if cached is not None and cached[0] == signature:
+                _, tail, complete = cached
+                if limit <= len(tail) or complete:
+                    return list(islice(tail, max(len(tail) - limit, 0), None))
+            
+            maxlen = max(limit, _TAIL_CACHE_LINES)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    tail = deque((line for line in f if line.strip()), maxlen=maxlen)
+            except FileNotFoundError:
+                return []
+            self._tails[path] = (signature, tail, len(tail) < maxlen)
+            return list(islice(tail, max(len(tail) - limit, 0), None))
     
-    def _write_json(self, path: Path, data: list) -> None:
-        """Write JSON file synchronously."""
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+        """Modification time and size of a file, or None if it does not exist."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_lines(self, path: Path) -> List[str]:
+        """Read all non-empty lines of a file synchronously."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return [line for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
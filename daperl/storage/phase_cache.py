@@ -0,0 +1,242 @@
+"""File-based stores of agent phase results."""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import orjson
+
+from daperl.core.models import AgentContext
+
+
+class PhaseResultCache:
+    """
+    Content-addressed cache of serialized phase results, one file per key.
+    
+    Every worker that mounts the cache directory shares it, so a run with
+    unchanged inputs can reuse a result computed by any earlier run. Entries
+    expire ttl_seconds after they were written. Writes also delete expired
+    entries, at most once per sweep interval, so the directory does not grow
+    without bound.
+    
+    Only phases whose agents have no side effects may be cached: a hit skips
+    the agent entirely.
+    """
+    
+    def __init__(
+        self,
+        cache_path: str = "./data/phase_cache",
+        ttl_seconds: float = 3600,
+        sweep_interval_seconds: float = 300
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_path: Directory holding the cached results
+            ttl_seconds: How long an entry stays valid
+            sweep_interval_seconds: Minimum time between sweeps for expired entries
+        """
+        self.cache_path = Path(cache_path)
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._next_sweep = 0.0
+        
+        # Ensure directory exists
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(phase: str, context: AgentContext, llm_config_json: str) -> str:
+        """
+        Build a cache key from everything a phase reads.
+        
+        Result timestamps are left out, so the earlier results of two runs
+        with the same outcome produce the same key.
+        
+        Args:
+            phase: Name of the phase
+            context: The agent context the phase runs on
+            llm_config_json: Serialized LLM configuration of the phase's agent
+        
+        Returns:
+            Hex digest identifying the phase inputs
+        """
+        inputs = context.model_dump(
+            mode="json",
+            include={"domain", "data", "config", "history"},
+            exclude={"history": {"__all__": {"timestamp"}}}
+        )
+        content = orjson.dumps(
+            [phase, llm_config_json, inputs],
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+        return hashlib.sha256(content).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result.
+        
+        Args:
+            key: Cache key from make_key
+        
+        Returns:
+            The cached result JSON, or None on a miss or expired entry
+        """
+        return await asyncio.to_thread(self._read, key)
+    
+    async def set(self, key: str, result_json: str) -> None:
+        """
+        Store a result.
+        
+        Args:
+            key: Cache key from make_key
+            result_json: JSON of the result to cache
+        """
+        await asyncio.to_thread(self._write, key, result_json)
+    
+    def _read(self, key: str) -> Optional[str]:
+        """Read an entry synchronously, dropping it if it has expired."""
+        path = self.cache_path / f"{key}.json"
+        try:
+            if path.stat().st_mtime + self.ttl_seconds < time.time():
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+    
+    def _write(self, key: str, result_json: str) -> None:
+        """Write an entry synchronously, sweeping expired entries when due."""
+        _write_atomic(self.cache_path / f"{key}.json", result_json)
+        
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval_seconds
+            self._sweep()
+    
+    def _sweep(self) -> None:
+        """Delete every expired entry."""
+        oldest = time.time() - self.ttl_seconds
+        for path in self.cache_path.glob("*.json"):
+            try:
+                if path.stat().st_mtime < oldest:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+
+class PhaseSnapshotStore:
+    """
+    Phase results of workflow runs, kept so a rerun can skip finished phases.
+    
+    Each run's results are stored as JSON under ``{snapshot_path}/{run_key}/``,
+    one file per phase. The run key identifies both the workflow and its
+    input, so a workflow id reused with different input starts over.
+    
+    Completed runs clear their snapshots. Runs that failed, were cancelled or
+    were terminated keep them for a rerun; saves delete every run whose
+    newest snapshot is older than ttl_seconds, at most once per sweep
+    interval.
+    """
+    
+    def __init__(
+        self,
+        snapshot_path: str = "./data/phase_snapshots",
+        ttl_seconds: float = 86400,
+        sweep_interval_seconds: float = 300
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            snapshot_path: Directory holding the snapshots
+            ttl_seconds: How long the snapshots of an abandoned run are kept
+            sweep_interval_seconds: Minimum time between sweeps for expired runs
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._next_sweep = 0.0
+        
+        # Ensure directory exists
+        self.snapshot_path.mkdir(parents=True, exist_ok=True)
+    
+    def save(self, run_key: str, phase: str, result_json: str) -> None:
+        """
+        Store the result of a finished phase.
+        
+        Args:
+            run_key: Key of the workflow run
+            phase: Name of the phase
+            result_json: JSON of the phase result
+        """
+        run_path = self.snapshot_path / run_key
+        run_path.mkdir(exist_ok=True)
+        _write_atomic(run_path / f"{phase}.json", result_json)
+        
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval_seconds
+            self._sweep()
+    
+    def load(self, run_key: str, ttl_seconds: float) -> Dict[str, str]:
+        """
+        Load the stored phase results of a workflow run.
+        
+        Args:
+            run_key: Key of the workflow run
+            ttl_seconds: Ignore results stored longer ago than this
+            
+        Returns:
+            Phase name -> result JSON, for every phase with a fresh snapshot
+        """
+        run_path = self.snapshot_path / run_key
+        if not run_path.is_dir():
+            return {}
+        
+        oldest = time.time() - ttl_seconds
+        snapshots = {}
+        for path in run_path.glob("*.json"):
+            try:
+                if path.stat().st_mtime >= oldest:
+                    snapshots[path.stem] = path.read_text(encoding='utf-8')
+            except FileNotFoundError:
+                continue
+        return snapshots
+    
+    def clear(self, run_key: str) -> None:
+        """
+        Delete the stored phase results of a workflow run.
+        
+        Args:
+            run_key: Key of the workflow run
+        """
+        shutil.rmtree(self.snapshot_path / run_key, ignore_errors=True)
+    
+    def _sweep(self) -> None:
+        """Delete every run whose newest snapshot has expired."""
+        oldest = time.time() - self.ttl_seconds
+        for run_path in self.snapshot_path.iterdir():
+            try:
+                if not run_path.is_dir():
+                    continue
+                newest = max(
+                    (path.stat().st_mtime for path in run_path.glob("*.json")),
+                    default=run_path.stat().st_mtime
+                )
+            except FileNotFoundError:
+                continue
+            if newest < oldest:
+                shutil.rmtree(run_path, ignore_errors=True)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write a file, replacing any earlier version atomically."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(text, encoding='utf-8')
+    os.replace(tmp_path, path)
@@ -1,14 +1,28 @@
 """Main DAPERL workflow implementation."""
 
+import asyncio
+import hashlib
 from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
 from temporalio import workflow
 from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
 
 with workflow.unsafe.imports_passed_through():
+    from pydantic import ValidationError
+    
     from daperl.core.models import (
         DAPERLInput,
         DAPERLResult,
         AgentContext,
+        AgentResult,
+        DetectionResult,
+        AnalysisResult,
+        PlanningResult,
+        ExecutionResult,
+        ReportingResult,
+        LearningResult,
         WorkflowStatus,
     )
     from daperl.core.types import AgentPhase
@@ -19,7 +33,25 @@ with workflow.unsafe.imports_passed_through():
         run_execution_agent,
         run_reporting_agent,
         run_learning_agent,
+        run_dap_combined,
+        persist_phase_snapshot,
+        load_phase_snapshots,
+        clear_phase_snapshots,
+    )
+
+
+# Phase name -> result class, for restoring phase snapshots
+_RESULT_TYPES: Dict[str, Type[AgentResult]] = {
+    result_type.model_fields["phase"].default.value: result_type
+    for result_type in (
+        DetectionResult,
+        AnalysisResult,
+        PlanningResult,
+        ExecutionResult,
+        ReportingResult,
+        LearningResult,
     )
+}
 
 
 @workflow.defn
@@ -40,6 +72,14 @@ class DAPERLWorkflow:
         self._learning_result = None
         self._plan_approved = False
         self._started_at = None
+        # Key of this run's phase snapshots; None when snapshots are off
+        self._snapshot_key = None
+        # Phase name -> result restored from an earlier run's snapshot
+        self._snapshots: Dict[str, AgentResult] = {}
+        # Phase name -> result already computed by a combined activity
+        self._precomputed: Dict[str, AgentResult] = {}
+        # Phase name -> (result, its dump), for answering get_results polls
+        self._result_dumps: Dict[str, Tuple[AgentResult, Dict[str, Any]]] = {}
     
     @workflow.run
     async def run(self, input: DAPERLInput) -> DAPERLResult:
@@ -62,10 +102,11 @@ class DAPERLWorkflow:
         
         # Phase 0: Get the data if it isn't sent in to the workflow
         # TODO
-
+        
         # Create agent context
         context = AgentContext(
             workflow_id=workflow_id,
+            run_id=workflow.info().run_id,
             domain=input.domain,
             data=input.data,
             history=[],
@@ -81,19 +122,62 @@ class DAPERLWorkflow:
             backoff_coefficient=2.0,
         )
         
+        # Phases finished by an earlier run with the same id and input are
+        # restored instead of run again. Histories recorded before snapshots
+        # existed replay without their local activities.
+        if workflow.patched("phase-snapshots"):
+            self._snapshot_key = hashlib.sha256(
+                f"{workflow_id}\0{input.model_dump_json()}".encode()
+            ).hexdigest()
+            try:
+                snapshots = await workflow.execute_local_activity(
+                    load_phase_snapshots,
+                    args=[self._snapshot_key, input.config.get("snapshot_ttl_s")],
+                    start_to_close_timeout=timedelta(seconds=10),
+                    retry_policy=retry_policy
+                )
+            except ActivityError as e:
+                workflow.logger.warning(f"Could not load phase snapshots: {e}")
+            else:
+                self._snapshots = self._restore_snapshots(snapshots)
+        
         try:
+            # Optionally run detection, analysis and planning in one activity
+            # when activity overhead outweighs their work
+            if (
+                input.config.get("fuse_dap", False)
+                and AgentPhase.DETECTION.value not in self._snapshots
+            ):
+                self._status = WorkflowStatus.DETECTING
+                workflow.logger.info("Phases 1-3: Detection, analysis and planning (combined)")
+                
+                combined = await workflow.execute_activity(
+                    run_dap_combined,
+                    context,
+                    start_to_close_timeout=timedelta(minutes=15),
+                    retry_policy=retry_policy
+                )
+                for result in (
+                    combined.detection_result,
+                    combined.analysis_result,
+                    combined.planning_result,
+                ):
+                    if result is not None:
+                        self._precomputed[result.phase.value] = result
+            
             # Phase 1: Detection
             self._status = WorkflowStatus.DETECTING
             workflow.logger.info("Phase 1: Detection")
             
-            self._detection_result = await workflow.execute_activity(
+            self._detection_result = await self._run_phase(
+                DetectionResult,
                 run_detection_agent,
                 context,
-                start_to_close_timeout=timedelta(minutes=5),
-                retry_policy=retry_policy
+                timedelta(minutes=5),
+                retry_policy
             )
             
-            context.history.append(self._detection_result)
+            context.add_result(self._detection_result)
             workflow.logger.info(
                 f"Detection complete: {len(self._detection_result.problems)} problems found"
             )
@@ -101,21 +185,21 @@ class DAPERLWorkflow:
             # If no problems detected, complete workflow
             if not self._detection_result.problems_detected:
                 workflow.logger.info("No problems detected, completing workflow")
-                self._status = WorkflowStatus.COMPLETED
-                return self._build_result(workflow_id, "No problems detected")
+                return await self._complete(workflow_id, "No problems detected", retry_policy)
             
             # Phase 2: Analysis
             self._status = WorkflowStatus.ANALYZING
             workflow.logger.info("Phase 2: Analysis")
             
-            self._analysis_result = await workflow.execute_activity(
+            self._analysis_result = await self._run_phase(
+                AnalysisResult,
                 run_analysis_agent,
                 context,
-                start_to_close_timeout=timedelta(minutes=5),
-                retry_policy=retry_policy
+                timedelta(minutes=5),
+                retry_policy
             )
             
-            context.history.append(self._analysis_result)
+            context.add_result(self._analysis_result)
             workflow.logger.info(
                 f"Analysis complete: {len(self._analysis_result.root_causes)} root causes identified"
             )
@@ -124,28 +208,38 @@ class DAPERLWorkflow:
             self._status = WorkflowStatus.PLANNING
             workflow.logger.info("Phase 3: Planning")
             
-            self._planning_result = await workflow.execute_activity(
+            self._planning_result = await self._run_phase(
+                PlanningResult,
                 run_planning_agent,
                 context,
-                start_to_close_timeout=timedelta(minutes=5),
-                retry_policy=retry_policy
+                timedelta(minutes=5),
+                retry_policy
             )
             
-            context.history.append(self._planning_result)
+            context.add_result(self._planning_result)
             workflow.logger.info(
                 f"Planning complete: {len(self._planning_result.plan.actions) if self._planning_result.plan else 0} actions planned"
             )
             
-            # Phase 4: Wait for approval (if required)
-            if not input.auto_approve and self._planning_result.plan:
+            # Phase 4: Wait for approval (if required). A restored execution
+            # result means the plan was approved by an earlier run.
+            execution_restored = AgentPhase.EXECUTION.value in self._snapshots
+            if not input.auto_approve and self._planning_result.plan and not execution_restored:
                 self._status = WorkflowStatus.PENDING_APPROVAL
                 workflow.logger.info("Waiting for plan approval")
                 
-                # Wait for approval signal or timeout
-                await workflow.wait_condition(
-                    lambda: self._plan_approved,
-                    timeout=timedelta(hours=24)
-                )
+                # Wait for approval or cancel signal, or timeout
+                try:
+                    await workflow.wait_condition(
+                        lambda: self._plan_approved or self._status == WorkflowStatus.CANCELLED,
+                        timeout=timedelta(hours=24)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                
+                if self._status == WorkflowStatus.CANCELLED:
+                    workflow.logger.info("Workflow cancelled while waiting for approval")
+                    return self._build_result(workflow_id, "Workflow cancelled")
                 
                 if not self._plan_approved:
                     workflow.logger.info("Plan approval timeout, cancelling workflow")
@@ -155,60 +249,101 @@ class DAPERLWorkflow:
                 workflow.logger.info("Plan approved, proceeding with execution")
             else:
                 self._plan_approved = True
-                workflow.logger.info("Auto-approval enabled or no plan, skipping approval")
+                workflow.logger.info("Auto-approval enabled, no plan, or already executed; skipping approval")
             
             # Phase 5: Execution
             self._status = WorkflowStatus.EXECUTING
             workflow.logger.info("Phase 4: Execution")
             
-            self._execution_result = await workflow.execute_activity(
-                run_execution_agent,
-                context,
-                start_to_close_timeout=timedelta(minutes=15),
-                retry_policy=retry_policy
-            )
+            if self._planning_result.plan is None and workflow.patched("skip-execution-without-plan"):
+                # Nothing to execute, so skip the activity round trip
+                self._execution_result = ExecutionResult(
+                    success=True,
+                    message="No plan to execute",
+                    confidence=1.0,
+                    confidence_level="very_high",
+                    plan_id="none",
+                    execution_summary="No plan found, no execution needed",
+                    timestamp=workflow.now()
+                )
+            else:
+                self._execution_result = await self._run_phase(
+                    ExecutionResult,
+                    run_execution_agent,
+                    context,
+                    timedelta(minutes=15),
+                    retry_policy
+                )
             
-            context.history.append(self._execution_result)
+            context.add_result(self._execution_result)
             workflow.logger.info(
                 f"Execution complete: {self._execution_result.success_count} succeeded, "
                 f"{self._execution_result.failure_count} failed"
             )
             
-            # Phase 6: Reporting
-            self._status = WorkflowStatus.REPORTING
-            workflow.logger.info("Phase 5: Reporting")
-            
-            self._reporting_result = await workflow.execute_activity(
-                run_reporting_agent,
-                context,
-                start_to_close_timeout=timedelta(minutes=5),
-                retry_policy=retry_policy
-            )
-            
-            context.history.append(self._reporting_result)
-            workflow.logger.info("Reporting complete")
-            
-            # Phase 7: Learning
-            self._status = WorkflowStatus.LEARNING
-            workflow.logger.info("Phase 6: Learning")
-            
-            self._learning_result = await workflow.execute_activity(
-                run_learning_agent,
-                context,
-                start_to_close_timeout=timedelta(minutes=5),
-                retry_policy=retry_policy
-            )
+            if workflow.patched("parallel-reporting-learning"):
+                # Phases 6 and 7: Reporting and learning only read the earlier
+                # phase results, so they run side by side
+                self._status = WorkflowStatus.FINALIZING
+                workflow.logger.info("Phases 5 and 6: Reporting and learning")
+                
+                self._reporting_result, self._learning_result = await asyncio.gather(
+                    self._run_phase(
+                        ReportingResult,
+                        run_reporting_agent,
+                        context,
+                        timedelta(minutes=5),
+                        retry_policy
+                    ),
+                    self._run_phase(
+                        LearningResult,
+                        run_learning_agent,
+                        context,
+                        timedelta(minutes=5),
+                        retry_policy
+                    )
+                )
+                
+                context.add_result(self._reporting_result)
+                context.add_result(self._learning_result)
+            else:
+                # Histories recorded before the two phases ran side by side
+                # replay them one after the other
+                self._status = WorkflowStatus.REPORTING
+                workflow.logger.info("Phase 5: Reporting")
+                
+                self._reporting_result = await self._run_phase(
+                    ReportingResult,
+                    run_reporting_agent,
+                    context,
+                    timedelta(minutes=5),
+                    retry_policy
+                )
+                context.add_result(self._reporting_result)
+                
+                self._status = WorkflowStatus.LEARNING
+                workflow.logger.info("Phase 6: Learning")
+                
+                self._learning_result = await self._run_phase(
+                    LearningResult,
+                    run_learning_agent,
+                    context,
+                    timedelta(minutes=5),
+                    retry_policy
+                )
+                context.add_result(self._learning_result)
             
-            context.history.append(self._learning_result)
             workflow.logger.info(
-                f"Learning complete: {len(self._learning_result.insights)} insights generated"
+                f"Reporting and learning complete: "
+                f"{len(self._learning_result.insights)} insights generated"
             )
             
             # Complete
-            self._status = WorkflowStatus.COMPLETED
             workflow.logger.info("DAPERL workflow completed successfully")
             
-            return self._build_result(workflow_id, "Workflow completed successfully")
+            return await self._complete(
+                workflow_id, "Workflow completed successfully", retry_policy
+            )
             
         except Exception as e:
             workflow.logger.error(f"Workflow failed: {str(e)}")
@@ -245,21 +380,151 @@ class DAPERLWorkflow:
     def get_plan(self) -> dict:
         """Query to get the current execution plan."""
         if self._planning_result and self._planning_result.plan:
-            return self._planning_result.plan.model_dump()
+            return self._planning_result.plan.model_dump(mode="json", exclude_none=True)
         return None
     
     @workflow.query
     def get_results(self) -> dict:
         """Query to get all results."""
         return {
-            "detection": self._detection_result.model_dump() if self._detection_result else None,
-            "analysis": self._analysis_result.model_dump() if self._analysis_result else None,
-            "planning": self._planning_result.model_dump() if self._planning_result else None,
-            "execution": self._execution_result.model_dump() if self._execution_result else None,
-            "reporting": self._reporting_result.model_dump() if self._reporting_result else None,
-            "learning": self._learning_result.model_dump() if self._learning_result else None,
+            "detection": self._dump_result("detection", self._detection_result),
+            "analysis": self._dump_result("analysis", self._analysis_result),
+            "planning": self._dump_result("planning", self._planning_result),
+            "execution": self._dump_result("execution", self._execution_result),
+            "reporting": self._dump_result("reporting", self._reporting_result),
+            "learning": self._dump_result("learning", self._learning_result),
         }
     
+    def _dump_result(self, name: str, result: Optional[AgentResult]) -> Optional[Dict[str, Any]]:
+        """
+        Dump a phase result for a query, reusing the last dump of the same object.
+        
+        Phase results are assigned once and not modified afterwards, so
+        repeated status polls only pay for dumping each result once. Fields
+        that are None are left out to keep query responses small.
+        
+        Args:
+            name: Name of the phase
+            result: The phase result, if the phase has finished
+            
+        Returns:
+            The dumped result, or None if there is no result yet
+        """
+        if result is None:
+            return None
+        cached = self._result_dumps.get(name)
+        if cached is None or cached[0] is not result:
+            cached = (result, result.model_dump(mode="json", exclude_none=True))
+            self._result_dumps[name] = cached
+        return cached[1]
+    
+    async def _run_phase(
+        self,
+        result_type: Type[AgentResult],
+        agent_activity: Callable,
+        context: AgentContext,
+        timeout: timedelta,
+        retry_policy: RetryPolicy
+    ) -> AgentResult:
+        """
+        Run one phase, or restore its result from an earlier run's snapshot.
+        
+        A result already computed by the combined detection, analysis and
+        planning activity is used instead of running the phase's activities.
+        
+        Args:
+            result_type: Result class of the phase
+            agent_activity: Activity that runs the phase's agent
+            context: Agent context
+            timeout: Start-to-close timeout of the agent activity
+            retry_policy: Retry policy for the phase's activities
+            
+        Returns:
+            The phase result
+        """
+        phase = result_type.model_fields["phase"].default.value
+        restored = self._snapshots.get(phase)
+        if restored is not None:
+            workflow.logger.info(f"Restored {phase} result from snapshot")
+            return restored
+        
+        result = self._precomputed.pop(phase, None)
+        if result is None:
+            result = await workflow.execute_activity(
+                agent_activity,
+                context,
+                start_to_close_timeout=timeout,
+                retry_policy=retry_policy
+            )
+        
+        if self._snapshot_key is not None:
+            try:
+                await workflow.execute_local_activity(
+                    persist_phase_snapshot,
+                    args=[self._snapshot_key, phase, result.model_dump_json()],
+                    start_to_close_timeout=timedelta(seconds=10),
+                    retry_policy=retry_policy
+                )
+            except ActivityError as e:
+                # Snapshots only speed up reruns; losing one must not fail this run
+                workflow.logger.warning(f"Could not persist {phase} snapshot: {e}")
+        return result
+    
+    def _restore_snapshots(self, snapshots: Dict[str, str]) -> Dict[str, AgentResult]:
+        """
+        Parse the phase snapshots loaded for this run.
+        
+        A snapshot that no longer matches its result model, e.g. one written
+        before a model change, is dropped so its phase runs again.
+        
+        Args:
+            snapshots: Phase name -> result JSON
+            
+        Returns:
+            Phase name -> restored result
+        """
+        restored = {}
+        for phase, result_json in snapshots.items():
+            result_type = _RESULT_TYPES.get(phase)
+            if result_type is None:
+                continue
+            try:
+                restored[phase] = result_type.model_validate_json(result_json)
+            except ValidationError as e:
+                workflow.logger.warning(f"Ignoring unreadable {phase} snapshot, rerunning phase: {e}")
+        return restored
+    
+    async def _complete(
+        self,
+        workflow_id: str,
+        summary: str,
+        retry_policy: RetryPolicy
+    ) -> DAPERLResult:
+        """
+        Mark the workflow completed and delete its phase snapshots.
+        
+        Args:
+            workflow_id: ID of the workflow
+            summary: Summary of the workflow result
+            retry_policy: Retry policy for the cleanup activity
+            
+        Returns:
+            The workflow result
+        """
+        self._status = WorkflowStatus.COMPLETED
+        if self._snapshot_key is not None:
+            try:
+                await workflow.execute_local_activity(
+                    clear_phase_snapshots,
+                    self._snapshot_key,
+                    start_to_close_timeout=timedelta(seconds=10),
+                    retry_policy=retry_policy
+                )
+            except ActivityError as e:
+                # Leftover snapshots expire with their TTL
+                workflow.logger.warning(f"Could not clear phase snapshots: {e}")
+        return self._build_result(workflow_id, summary)
+    
     def _build_result(self, workflow_id: str, summary: str) -> DAPERLResult:
         """Build the workflow result."""
         return DAPERLResult(
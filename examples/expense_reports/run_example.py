@@ -13,7 +13,7 @@ from temporalio.client import Client
 
 from daperl.workflows import DAPERLWorkflow
 from daperl.core.models import DAPERLInput
-from daperl.config.settings import settings
+from daperl.config.settings import get_settings
 
 
 async def main():
@@ -53,7 +53,7 @@ async def main():
     }
     
     # Get Temporal configuration
-    temporal_config = settings.get_temporal_config()
+    temporal_config = get_settings().get_temporal_config()
     
     try:
         # Connect to Temporal
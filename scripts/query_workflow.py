@@ -5,7 +5,7 @@ import argparse
 import json
 from temporalio.client import Client
 
-from daperl.config.settings import settings
+from daperl.config.settings import get_settings
 from daperl.workflows import DAPERLWorkflow
 
 
@@ -18,7 +18,7 @@ async def main():
     args = parser.parse_args()
     
     # Get Temporal configuration
-    temporal_config = settings.get_temporal_config()
+    temporal_config = get_settings().get_temporal_config()
     
     # Connect to Temporal
     client = await Client.connect(temporal_config.host, namespace=temporal_config.namespace)
@@ -1,10 +1,12 @@
 """Run a Temporal worker for DAPERL workflows."""
 
 import asyncio
+import signal
+from concurrent.futures import ThreadPoolExecutor
 from temporalio.client import Client
 from temporalio.worker import Worker
 
-from daperl.config.settings import settings
+from daperl.config.settings import get_settings
 from daperl.workflows import DAPERLWorkflow
 from daperl.activities import (
     run_detection_agent,
@@ -13,13 +15,19 @@ from daperl.activities import (
     run_execution_agent,
     run_reporting_agent,
     run_learning_agent,
+    run_agents_parallel,
+    run_dap_combined,
+    persist_phase_snapshot,
+    load_phase_snapshots,
+    clear_phase_snapshots,
 )
+from daperl.activities.agent_activities import reload_config
 
 
 async def main():
     """Run the DAPERL worker."""
     # Get Temporal configuration
-    temporal_config = settings.get_temporal_config()
+    temporal_config = get_settings().get_temporal_config()
     
     # Connect to Temporal
     client = await Client.connect(temporal_config.host, namespace=temporal_config.namespace)
@@ -40,9 +48,20 @@ async def main():
             run_execution_agent,
             run_reporting_agent,
             run_learning_agent,
+            run_agents_parallel,
+            run_dap_combined,
+            persist_phase_snapshot,
+            load_phase_snapshots,
+            clear_phase_snapshots,
         ],
+        # Sync activities (the phase snapshots) run on this executor
+        activity_executor=ThreadPoolExecutor(max_workers=4),
     )
     
+    # SIGHUP reloads settings from the environment and .env (where supported)
+    if hasattr(signal, "SIGHUP"):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_config)
+    
     print("\nWorker started. Polling for tasks...")
     print("Press Ctrl+C to stop")
     
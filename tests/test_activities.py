@@ -0,0 +1,92 @@
+"""Tests for DAPERL activity type hints."""
+
+from typing import get_type_hints
+
+from temporalio.converter import DataConverter
+
+from daperl.activities import agent_activities, run_agents_parallel
+from daperl.config.settings import LLMConfig, get_settings
+from daperl.core.models import AgentContext, DetectionResult, LearningResult, Problem
+from daperl.core.types import ConfidenceLevel
+from daperl.storage.phase_cache import PhaseResultCache
+
+
+def test_run_agents_parallel_results_round_trip():
+    """Results keep their phase class through the default data converter."""
+    detection = DetectionResult(
+        success=True,
+        message="Found one problem",
+        confidence=0.8,
+        confidence_level=ConfidenceLevel.HIGH,
+        problems_detected=True,
+        problems=[Problem(id="p1", type="t", description="d", severity="low")],
+    )
+    learning = LearningResult(
+        success=True,
+        message="Learning complete",
+        confidence=0.6,
+        confidence_level=ConfidenceLevel.MEDIUM,
+    )
+    return_type = get_type_hints(run_agents_parallel)["return"]
+    converter = DataConverter.default.payload_converter
+    
+    payloads = converter.to_payloads([[detection, learning]])
+    [decoded] = converter.from_payloads(payloads, [return_type])
+    
+    assert decoded == [detection, learning]
+    assert type(decoded[0]) is DetectionResult
+    assert type(decoded[1]) is LearningResult
+
+
+def test_reload_config_picks_up_new_settings(monkeypatch):
+    """Reloading loads new settings and drops what was built from the old ones."""
+    monkeypatch.setenv("MAX_PARALLEL_AGENTS", "2")
+    agent_activities.reload_config()
+    assert get_settings().max_parallel_agents == 2
+    
+    old_settings = get_settings()
+    phase_cache = agent_activities._phase_cache()
+    monkeypatch.setenv("MAX_PARALLEL_AGENTS", "7")
+    agent_activities.reload_config()
+    
+    assert get_settings() is not old_settings
+    assert get_settings().max_parallel_agents == 7
+    assert agent_activities._phase_cache() is not phase_cache
+    
+    monkeypatch.undo()
+    agent_activities.reload_config()
+
+
+class _CountingAgent:
+    """Agent stand-in that counts its runs."""
+    
+    llm_config = LLMConfig(model="test-model")
+    
+    def __init__(self):
+        self.runs = 0
+    
+    async def run(self, context):
+        self.runs += 1
+        return DetectionResult(
+            success=True,
+            message=f"Run {self.runs}",
+            confidence=0.8,
+            confidence_level=ConfidenceLevel.HIGH,
+        )
+
+
+async def test_run_memoized_is_opt_in(monkeypatch, tmp_path):
+    """Phase results are only reused when the run asks for it."""
+    monkeypatch.setattr(agent_activities, "_phase_cache", lambda: PhaseResultCache(str(tmp_path)))
+    agent = _CountingAgent()
+    
+    context = AgentContext(workflow_id="wf", domain="test")
+    await agent_activities._run_memoized(agent, context, DetectionResult)
+    await agent_activities._run_memoized(agent, context, DetectionResult)
+    assert agent.runs == 2
+    
+    context = AgentContext(workflow_id="wf", domain="test", config={"memoize": True})
+    first = await agent_activities._run_memoized(agent, context, DetectionResult)
+    second = await agent_activities._run_memoized(agent, context, DetectionResult)
+    assert agent.runs == 3
+    assert second == first
@@ -0,0 +1,201 @@
+"""Tests for the DAPERL agents."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from daperl.agents import AnalysisAgent, ExecutionAgent, LearningAgent, PlanningAgent
+from daperl.core.models import (
+    Action,
+    AgentContext,
+    AnalysisResult,
+    DetectionResult,
+    ExecutionPlan,
+    MetricSummary,
+    PlanningResult,
+    Problem,
+)
+from daperl.core.types import ConfidenceLevel
+
+
+class _FailingStorage:
+    """Learning storage whose metric writes fail."""
+    
+    async def get_recent_summaries(self, limit: int = 10):
+        return []
+    
+    async def store_metric(self, metric):
+        raise OSError("disk full")
+
+
+class _HistoryStorage:
+    """Learning storage holding fixed summaries."""
+    
+    def __init__(self, summaries):
+        self.summaries = summaries
+    
+    async def get_recent_summaries(self, limit: int = 10):
+        return self.summaries
+    
+    async def store_metric(self, metric):
+        pass
+
+
+async def test_learning_history_skips_only_the_current_run(monkeypatch):
+    """Earlier runs that reused the workflow id stay in the history."""
+    seen = []
+    
+    async def learn(self, context, current_metrics, historical_metrics):
+        seen.extend(summary.run_id for summary in historical_metrics)
+    
+    monkeypatch.setattr(LearningAgent, "_learn", learn)
+    summaries = [
+        MetricSummary(
+            workflow_id="wf", run_id=run_id, timestamp=datetime.now(timezone.utc),
+            domain="test", overall_success=True
+        )
+        for run_id in ("run-1", "run-2", None)
+    ]
+    agent = LearningAgent(storage=_HistoryStorage(summaries), llm_client=object())
+    
+    await agent.execute(AgentContext(workflow_id="wf", run_id="run-2", domain="test"))
+    
+    assert seen == ["run-1", None]
+
+
+async def test_learning_error_is_not_replaced_by_storage_error(monkeypatch):
+    """A failed metric write does not hide the error that ended learning."""
+    async def failing_learn(self, context, current_metrics, historical_metrics):
+        raise RuntimeError("LLM unavailable")
+    
+    monkeypatch.setattr(LearningAgent, "_learn", failing_learn)
+    agent = LearningAgent(storage=_FailingStorage(), llm_client=object())
+    
+    with pytest.raises(RuntimeError, match="LLM unavailable"):
+        await agent.execute(AgentContext(workflow_id="wf", domain="test"))
+
+
+async def test_learning_surfaces_storage_error_on_success(monkeypatch):
+    """A failed metric write is still reported when learning succeeds."""
+    async def learn(self, context, current_metrics, historical_metrics):
+        return None
+    
+    monkeypatch.setattr(LearningAgent, "_learn", learn)
+    agent = LearningAgent(storage=_FailingStorage(), llm_client=object())
+    
+    with pytest.raises(OSError, match="disk full"):
+        await agent.execute(AgentContext(workflow_id="wf", domain="test"))
+
+
+def _action(action_id: str, *depends_on: str) -> Action:
+    return Action(
+        id=action_id,
+        action_type="record",
+        description=f"Action {action_id}",
+        target="test",
+        confidence=0.9,
+        depends_on=list(depends_on),
+    )
+
+
+def _plan_context(*actions: Action) -> AgentContext:
+    context = AgentContext(workflow_id="wf", domain="test")
+    context.add_result(PlanningResult(
+        success=True,
+        message="Planning complete",
+        confidence=0.9,
+        confidence_level=ConfidenceLevel.HIGH,
+        plan=ExecutionPlan(id="plan", actions=list(actions)),
+    ))
+    return context
+
+
+def _recording_agent(events: list) -> ExecutionAgent:
+    """Execution agent whose only handler logs when each action starts and ends."""
+    async def record(action, context):
+        events.append(("start", action.id))
+        await asyncio.sleep(0.01)
+        events.append(("end", action.id))
+        return {"success": True}
+    
+    return ExecutionAgent(action_registry={"record": record}, max_parallel_actions=4)
+
+
+async def test_execution_without_dependencies_runs_in_plan_order():
+    """Plans that declare no dependencies run one action at a time, in order."""
+    events = []
+    context = _plan_context(_action("a"), _action("b"), _action("c"))
+    
+    result = await _recording_agent(events).execute(context)
+    
+    assert result.success_count == 3
+    assert events == [
+        ("start", "a"), ("end", "a"),
+        ("start", "b"), ("end", "b"),
+        ("start", "c"), ("end", "c"),
+    ]
+
+
+async def test_execution_with_dependencies_runs_independent_actions_together():
+    """Independent actions overlap; dependent actions wait for their dependencies."""
+    events = []
+    context = _plan_context(_action("a"), _action("b"), _action("c", "a", "b"))
+    
+    result = await _recording_agent(events).execute(context)
+    
+    assert [action.action_id for action in result.actions_executed] == ["a", "b", "c"]
+    assert events[:2] == [("start", "a"), ("start", "b")]
+    assert events.index(("start", "c")) > max(events.index(("end", "a")), events.index(("end", "b")))
+
+
+def test_dependency_batches_break_cycles():
+    """A dependency cycle is broken by running the first remaining action alone."""
+    actions = [_action("a", "b"), _action("b", "a"), _action("c")]
+    
+    batches = ExecutionAgent()._dependency_batches(actions)
+    
+    assert [[action.id for _, action in batch] for batch in batches] == [["c"], ["a"], ["b"]]
+
+
+async def test_analysis_rejects_out_of_range_confidence(monkeypatch):
+    """An out-of-range confidence is reported as invalid analysis output."""
+    async def complete_json(self, messages, system_prompt, response_model, **kwargs):
+        return response_model.model_validate_json(
+            '{"root_causes": [], "recommendations": [], "confidence": 1.5}'
+        )
+    
+    monkeypatch.setattr(AnalysisAgent, "_complete_json", complete_json)
+    context = AgentContext(workflow_id="wf", domain="test")
+    context.add_result(DetectionResult(
+        success=True,
+        message="Found one problem",
+        confidence=0.8,
+        confidence_level=ConfidenceLevel.HIGH,
+        problems_detected=True,
+        problems=[Problem(id="p1", type="t", description="d", severity="low")],
+    ))
+    
+    with pytest.raises(ValueError, match="Invalid analysis output"):
+        await AnalysisAgent(llm_client=object()).execute(context)
+
+
+async def test_planning_skips_llm_for_info_only_problems(monkeypatch):
+    """Problems that need no remediation do not reach the planning LLM."""
+    async def complete_json(self, messages, system_prompt, response_model, **kwargs):
+        raise AssertionError("planning LLM called")
+    
+    monkeypatch.setattr(PlanningAgent, "_complete_json", complete_json)
+    context = AgentContext(workflow_id="wf", domain="test")
+    context.add_result(AnalysisResult(
+        success=True,
+        message="Analyzed one problem",
+        confidence=0.8,
+        confidence_level=ConfidenceLevel.HIGH,
+        analyzed_problems=[Problem(id="p1", type="t", description="d", severity="info")],
+    ))
+    
+    result = await PlanningAgent(llm_client=object()).execute(context)
+    
+    assert result.success
+    assert result.plan is None
@@ -0,0 +1,98 @@
+"""Tests for the JSON learning storage."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import orjson
+
+from daperl.core.models import DetectionResult, ExecutionMetric, LearningInsight, Problem
+from daperl.core.types import ConfidenceLevel
+from daperl.storage.json_storage import JSONLearningStorage
+
+
+def _metric(workflow_id: str, **kwargs) -> ExecutionMetric:
+    return ExecutionMetric(
+        workflow_id=workflow_id,
+        timestamp=datetime.now(timezone.utc),
+        domain="test",
+        overall_success=True,
+        **kwargs
+    )
+
+
+def _insight(insight_id: str) -> LearningInsight:
+    return LearningInsight(
+        id=insight_id,
+        insight_type="general",
+        description=f"Insight {insight_id}",
+        confidence=0.5,
+    )
+
+
+async def test_legacy_array_files_are_migrated(tmp_path):
+    """Records in the earlier single-array files carry over to NDJSON."""
+    metrics = [_metric("wf-1"), _metric("wf-2")]
+    (tmp_path / "metrics.json").write_bytes(
+        orjson.dumps([metric.model_dump(mode="json") for metric in metrics])
+    )
+    (tmp_path / "insights.json").write_bytes(
+        orjson.dumps([_insight("i-1").model_dump(mode="json")])
+    )
+    
+    storage = JSONLearningStorage(str(tmp_path / "learning.json"))
+    
+    assert [m.workflow_id for m in await storage.get_recent_metrics()] == ["wf-2", "wf-1"]
+    assert [s.workflow_id for s in await storage.get_recent_summaries()] == ["wf-2", "wf-1"]
+    assert [i.id for i in await storage.get_insights()] == ["i-1"]
+
+
+async def test_concurrent_appends_keep_every_line_whole(tmp_path):
+    """Concurrent appends from two instances interleave only whole lines."""
+    path = str(tmp_path / "learning.json")
+    first, second = JSONLearningStorage(path), JSONLearningStorage(path)
+    
+    await asyncio.gather(*(
+        storage.store_metric(_metric(f"wf-{i}"))
+        for i in range(50)
+        for storage in (first, second)
+    ))
+    
+    lines = (tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 100
+    assert all(ExecutionMetric.model_validate_json(line) for line in lines)
+    assert len(await first.get_recent_summaries(limit=200)) == 100
+
+
+async def test_tail_cache_sees_appends_from_other_instances(tmp_path):
+    """A cached tail is dropped once another writer appends to the file."""
+    path = str(tmp_path / "learning.json")
+    reader, writer = JSONLearningStorage(path), JSONLearningStorage(path)
+    await reader.store_insight(_insight("i-1"))
+    assert [i.id for i in await reader.get_insights()] == ["i-1"]
+    
+    await writer.store_insight(_insight("i-2"))
+    
+    assert [i.id for i in await reader.get_insights()] == ["i-2", "i-1"]
+
+
+async def test_get_metric_ignores_ids_in_nested_payloads(tmp_path):
+    """A newer record mentioning the id in its payload is not returned."""
+    storage = JSONLearningStorage(str(tmp_path / "learning.json"))
+    decoy = DetectionResult(
+        success=True,
+        message="Found one problem",
+        confidence=0.8,
+        confidence_level=ConfidenceLevel.HIGH,
+        problems=[Problem(
+            id="p1", type="t", description="d", severity="low",
+            data={"workflow_id": "wf-target"}
+        )],
+    )
+    await storage.store_metric(_metric("wf-target"))
+    await storage.store_metric(_metric("wf-other", detection_result=decoy))
+    
+    metric = await storage.get_metric("wf-target")
+    
+    assert metric is not None
+    assert metric.workflow_id == "wf-target"
+    assert await storage.get_metric("wf-missing") is None
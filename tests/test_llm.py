@@ -0,0 +1,168 @@
+"""Tests for the LLM clients."""
+
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import litellm
+import pytest
+
+from daperl.config.settings import LLMConfig
+from daperl.llm.base import LLMMessage
+from daperl.llm.cache import SemanticCache
+from daperl.llm.factory import LLMFactory
+from daperl.llm.providers import litellm_provider
+
+
+class _FakeStream:
+    """Async iterator over canned completion chunks that records closing."""
+    
+    def __init__(self, parts, error=None):
+        self._parts = iter(parts)
+        self._error = error
+        self.closed = False
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        try:
+            part = next(self._parts)
+        except StopIteration:
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))])
+    
+    async def aclose(self):
+        self.closed = True
+
+
+async def test_json_stream_returns_once_json_closes(monkeypatch):
+    """The stream is closed as soon as the top-level JSON value is complete."""
+    stream = _FakeStream(['{"a": [1, ', '"}"]}', " trailing", " text"])
+    
+    async def fake_acompletion(**params):
+        assert params["stream"] is True
+        return stream
+    
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_acompletion)
+    client = litellm_provider.LiteLLMClient(model="test-model", stream_json=True)
+    
+    raw = await client.complete_with_json_raw_stream([LLMMessage(role="user", content="hi")])
+    
+    assert raw == '{"a": [1, "}"]}'
+    assert stream.closed
+
+
+def test_stream_json_setting_reaches_client():
+    """LLMConfig.stream_json is passed to the clients the factory builds."""
+    LLMFactory.clear_cache()
+    
+    assert LLMFactory.create(LLMConfig(model="test-model", stream_json=True)).stream_json
+    assert not LLMFactory.create(LLMConfig(model="test-model")).stream_json
+    
+    LLMFactory.clear_cache()
+
+
+@pytest.mark.parametrize("parts, expected", [
+    (["See [1]:\n", '{"a": 1}'], '{"a": 1}'),
+    (["See [1]: {\"x\": 2}\n", '{"a": 1}'], '{"a": 1}'),
+    (["Here you go:\n```json\n", '[1, 2]', "\n```"], "[1, 2]"),
+    (["```json {", '"a": "}"}', "```"], '{"a": "}"}'),
+    (["{not json}\n", '{"a": 1}'], '{"a": 1}'),
+])
+def test_json_scanner_skips_prose_brackets(parts, expected):
+    """Only brackets that start a line or follow a code fence start the JSON."""
+    scanner = litellm_provider._JSONScanner()
+    
+    results = [scanner.feed(part) for part in parts]
+    
+    assert expected in results
+
+
+def _client_with_stream(monkeypatch, stream=None, error=None):
+    """Client with a fake streamed completion and a fixed non-streaming fallback."""
+    async def fake_acompletion(**params):
+        if error is not None:
+            raise error
+        return stream
+    
+    async def fallback(self, messages, system_prompt=None, **kwargs):
+        return '{"fallback": true}'
+    
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_acompletion)
+    monkeypatch.setattr(litellm_provider.LiteLLMClient, "complete_with_json_raw", fallback)
+    return litellm_provider.LiteLLMClient(model="test-model", stream_json=True)
+
+
+async def test_json_stream_falls_back_when_interrupted(monkeypatch):
+    """An interrupted stream is retried without streaming."""
+    error = litellm.APIConnectionError(message="reset", llm_provider="openai", model="test-model")
+    stream = _FakeStream(['{"a": '], error=error)
+    client = _client_with_stream(monkeypatch, stream=stream)
+    
+    raw = await client.complete_with_json_raw_stream([LLMMessage(role="user", content="hi")])
+    
+    assert raw == '{"fallback": true}'
+    assert stream.closed
+
+
+async def test_json_stream_falls_back_on_incomplete_json(monkeypatch):
+    """A stream that ends before the JSON closes is retried without streaming."""
+    client = _client_with_stream(monkeypatch, stream=_FakeStream(['{"a": ']))
+    
+    raw = await client.complete_with_json_raw_stream([LLMMessage(role="user", content="hi")])
+    
+    assert raw == '{"fallback": true}'
+
+
+async def test_json_stream_raises_request_errors(monkeypatch):
+    """Errors that a retry cannot fix are raised instead of re-sent."""
+    error = litellm.AuthenticationError(message="bad key", llm_provider="openai", model="test-model")
+    client = _client_with_stream(monkeypatch, error=error)
+    
+    with pytest.raises(litellm.AuthenticationError):
+        await client.complete_with_json_raw_stream([LLMMessage(role="user", content="hi")])
+
+
+def test_agent_base_classes_do_not_import_litellm():
+    """LiteLLM is only imported once an LLM client is created."""
+    code = "import sys, daperl.core.agents, daperl.llm.cache; print('litellm' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    
+    assert output.strip() == "False"
+
+
+def _semantic_cache(monkeypatch, **kwargs) -> SemanticCache:
+    """Semantic cache whose embedding depends only on the text's first character."""
+    async def embed(self, text):
+        return [1.0, 0.0] if text.startswith("a") else [0.0, 1.0]
+    
+    monkeypatch.setattr(SemanticCache, "embed", embed)
+    return SemanticCache(**kwargs)
+
+
+async def test_semantic_cache_long_prompts_must_match_beyond_the_embedded_prefix(monkeypatch):
+    """Text past max_input_chars is not embedded but must match exactly."""
+    cache = _semantic_cache(monkeypatch, max_input_chars=4)
+    
+    raw, key = await cache.lookup("ns", "aaaa-tail-1")
+    assert raw is None
+    cache.add(key, '{"hit": 1}')
+    
+    assert (await cache.lookup("ns", "abcd-tail-1"))[0] == '{"hit": 1}'
+    assert (await cache.lookup("ns", "aaaa-tail-2"))[0] is None
+
+
+async def test_semantic_cache_logs_embedding_failures(monkeypatch, caplog):
+    """A failed embedding is a logged miss, not an error."""
+    async def embed(self, text):
+        raise RuntimeError("input too long")
+    
+    monkeypatch.setattr(SemanticCache, "embed", embed)
+    
+    assert await SemanticCache().lookup("ns", "text") == (None, None)
+    assert "input too long" in caplog.text
@@ -0,0 +1,97 @@
+"""Tests for the DAPERL data models."""
+
+from daperl.core.models import (
+    AgentContext,
+    AgentResult,
+    AnalysisResult,
+    DetectionResult,
+    ExecutionMetric,
+)
+from daperl.core.types import ConfidenceLevel
+
+
+def _detection(**kwargs) -> DetectionResult:
+    return DetectionResult(
+        success=True,
+        message="Detection complete",
+        confidence=0.8,
+        confidence_level=ConfidenceLevel.HIGH,
+        **kwargs
+    )
+
+
+def _analysis() -> AnalysisResult:
+    return AnalysisResult(
+        success=True,
+        message="Analysis complete",
+        confidence=0.7,
+        confidence_level=ConfidenceLevel.HIGH,
+    )
+
+
+class CustomDetectionResult(DetectionResult):
+    """A domain-specific detection result."""
+
+
+def test_get_result_finds_subclass_results():
+    """A subclass result is returned when its base class is looked up."""
+    context = AgentContext(workflow_id="wf", domain="test")
+    result = CustomDetectionResult(
+        success=True,
+        message="Detection complete",
+        confidence=0.8,
+        confidence_level=ConfidenceLevel.HIGH,
+    )
+    context.add_result(result)
+    
+    assert context.get_result(DetectionResult) is result
+    assert context.get_result(CustomDetectionResult) is result
+    assert context.get_result(AgentResult) is result
+    assert context.get_result(AnalysisResult) is None
+
+
+def test_get_result_after_direct_append_then_add_result():
+    """Appending to the history directly does not hide earlier results."""
+    context = AgentContext(workflow_id="wf", domain="test")
+    detection = _detection()
+    analysis = _analysis()
+    
+    context.history.append(detection)
+    context.add_result(analysis)
+    
+    assert context.get_result(DetectionResult) is detection
+    assert context.get_result(AnalysisResult) is analysis
+
+
+def test_get_result_returns_latest_of_a_type():
+    """The most recent result of a type wins."""
+    context = AgentContext(workflow_id="wf", domain="test")
+    first = _detection(summary="first")
+    second = _detection(summary="second")
+    
+    context.add_result(first)
+    context.add_result(_analysis())
+    context.add_result(second)
+    
+    assert context.get_result(DetectionResult) is second
+
+
+def test_get_result_after_deserialization():
+    """A context rebuilt from JSON indexes its history on first lookup."""
+    context = AgentContext(workflow_id="wf", domain="test")
+    context.add_result(_detection())
+    
+    restored = AgentContext.model_validate_json(context.model_dump_json())
+    
+    assert isinstance(restored.get_result(DetectionResult), DetectionResult)
+
+
+def test_execution_metric_loads_legacy_reporting_result():
+    """Stored metrics from before reporting_result was dropped still load."""
+    metric = ExecutionMetric.model_validate_json(
+        '{"workflow_id": "wf", "timestamp": "2025-01-01T00:00:00Z", "domain": "test",'
+        ' "reporting_result": null, "overall_success": true}'
+    )
+    
+    assert metric.workflow_id == "wf"
+    assert "reporting_result" not in metric.model_dump()
@@ -0,0 +1,47 @@
+"""Tests for the phase result stores."""
+
+import os
+import time
+
+from daperl.storage.phase_cache import PhaseResultCache, PhaseSnapshotStore
+
+
+def test_snapshot_store_clear_removes_run(tmp_path):
+    """Clearing a run deletes its snapshots but keeps other runs'."""
+    store = PhaseSnapshotStore(str(tmp_path))
+    store.save("run-a", "detection", '{"phase": "detection"}')
+    store.save("run-b", "detection", '{"phase": "detection"}')
+    
+    store.clear("run-a")
+    store.clear("missing-run")
+    
+    assert store.load("run-a", ttl_seconds=60) == {}
+    assert store.load("run-b", ttl_seconds=60) == {"detection": '{"phase": "detection"}'}
+
+
+async def test_phase_cache_write_sweeps_expired_entries(tmp_path):
+    """Writing an entry deletes expired entries that were never read again."""
+    cache = PhaseResultCache(str(tmp_path), ttl_seconds=60)
+    await cache.set("stale", "{}")
+    stale_path = tmp_path / "stale.json"
+    os.utime(stale_path, (time.time() - 120, time.time() - 120))
+    cache._next_sweep = 0.0
+    
+    await cache.set("fresh", "{}")
+    
+    assert not stale_path.exists()
+    assert await cache.get("fresh") == "{}"
+
+
+def test_snapshot_store_save_sweeps_abandoned_runs(tmp_path):
+    """Saving a snapshot deletes runs whose snapshots have all expired."""
+    store = PhaseSnapshotStore(str(tmp_path), ttl_seconds=60)
+    store.save("abandoned", "detection", "{}")
+    abandoned = tmp_path / "abandoned" / "detection.json"
+    os.utime(abandoned, (time.time() - 120, time.time() - 120))
+    store._next_sweep = 0.0
+    
+    store.save("current", "detection", "{}")
+    
+    assert not (tmp_path / "abandoned").exists()
+    assert store.load("current", ttl_seconds=60) == {"detection": "{}"}
@@ -0,0 +1,31 @@
+"""Tests for prompt serialization helpers."""
+
+from daperl.core.models import AgentContext
+from daperl.core.serialization import context_data_block
+
+
+def test_context_data_block_is_per_context():
+    """Contexts of the same workflow run do not share a data block."""
+    billing = AgentContext(workflow_id="wf", run_id="run", domain="billing", data={"x": 1})
+    shipping = AgentContext(workflow_id="wf", run_id="run", domain="shipping", data={"y": 2})
+    
+    assert context_data_block(billing) == '{"x":1}'
+    assert context_data_block(shipping) == '{"y":2}'
+
+
+def test_context_data_block_follows_new_data():
+    """Assigning new data to a context rebuilds its block."""
+    context = AgentContext(workflow_id="wf", domain="billing", data={"x": 1})
+    assert context_data_block(context) == '{"x":1}'
+    
+    context.data = {"x": 2}
+    assert context_data_block(context) == '{"x":2}'
+
+
+def test_context_data_block_follows_in_place_changes():
+    """Changing the data dict in place is reflected in the block."""
+    context = AgentContext(workflow_id="wf", domain="billing", data={"x": 1})
+    assert context_data_block(context) == '{"x":1}'
+    
+    context.data["x"] = 2
+    assert context_data_block(context) == '{"x":2}'